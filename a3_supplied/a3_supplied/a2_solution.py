@@ -1,7 +1,11 @@
 from __future__ import annotations
-from typing import Optional
+from collections.abc import Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
 from a2_support import UserInterface, TextInterface
 from constants import *
+from profiling import PROFILER, start_profiling
 
 
 class Tile:
@@ -163,6 +167,16 @@ class Honey(Food):
     _amount = HONEY_AMOUNT
 
 
+class Candy(Food):
+    """ Candy decreases the players hunger. """
+    _id = CANDY
+
+    def apply(self, player: 'Player') -> None:
+        """ Changes player's hunger to 0; Decrease player's health 2. """
+        player._hunger = 0
+        player.change_health(CANDY_HEALTH_AMOUNT)
+
+
 class Water(Item):
     """ Water decreases the player's thirst by 5. """
     _id = WATER
@@ -343,17 +357,137 @@ def load_game(filename: str) -> list['Level']:
         for line in file:
             line = line.strip()
             if line.startswith('Maze'):
-                _, _, dimensions = line[5:].partition(' - ')
-                dimensions = [int(item) for item in dimensions.split()]
-                levels.append(Level(dimensions))
+                levels.append(Level(_parse_dimensions(line)))
             elif len(line) > 0 and len(levels) > 0:
                 levels[-1].add_row(line)
-    print(levels)
     return levels
 
+def _parse_dimensions(header: str) -> list[int]:
+    """ Returns the [#rows, #columns] from a 'Maze N - rows cols' header line.
+
+    Parameters:
+        header: The stripped header line.
+    """
+    _, _, dimensions = header[5:].partition(' - ')
+    return [int(item) for item in dimensions.split()]
+
+def parse_level(lines: Iterable[str]) -> 'Level':
+    """ Creates a single level from its lines in a game file.
+
+    Parameters:
+        lines: The 'Maze' header line for the level followed by its rows.
+
+    Returns:
+        The Level described by the lines.
+    """
+    level = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith('Maze') and level is None:
+            level = Level(_parse_dimensions(line))
+        elif len(line) > 0 and level is not None:
+            level.add_row(line)
+    if level is None:
+        raise ValueError("no 'Maze' header in level lines")
+    return level
+
+
+class LazyLevels(Sequence):
+    """ The levels of a game file, each of which is only read and built the
+        first time it is accessed.
+
+        The file is read once on construction, and the byte offset of every
+        'Maze' header is indexed, so only the levels actually played are
+        parsed. Its content is kept, so editing the file mid-game does not
+        change the levels still to come.
+    """
+    def __init__(self, filename: str) -> None:
+        """ Reads and indexes the levels in the given game file.
+
+        Parameters:
+            filename: The path to the game file
+        """
+        self._filename = filename
+        self._offsets = [] # Byte offset of each level's header line
+        self._levels = {} # Maps level indices to levels built so far
+        with open(filename, 'rb') as file:
+            self._data = file.read()
+        offset = 0
+        for line in self._data.splitlines(keepends=True):
+            if line.strip().startswith(b'Maze'):
+                self._offsets.append(offset)
+            offset += len(line)
+        self._offsets.append(offset)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> 'Level':
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('level index out of range')
+
+        level = self._levels.get(index)
+        if level is None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            text = self._data[start:end].decode()
+            level = parse_level(text.splitlines())
+            self._levels[index] = level
+        return level
+
+    def is_loaded(self, index: int) -> bool:
+        """ Returns True iff the level at the given index has been built. """
+        return index in self._levels
+
+    def release(self, index: int) -> None:
+        """ Discards the built level at the given index, e.g. once it has been
+            finished. It will be parsed again if accessed later.
+
+        Parameters:
+            index: The index of the level to discard.
+        """
+        self._levels.pop(index, None)
+
+    def __repr__(self) -> str:
+        return f"LazyLevels('{self._filename}')"
+
+class MazeRow(Sequence):
+    """ A read-only view of one row of a maze. Tiles are looked up from the
+        maze's tile buffer as they are accessed, so no Tile instances are
+        stored per row.
+    """
+    def __init__(self, maze: 'Maze', row: int) -> None:
+        """ Sets up a view of the given row of the maze.
+
+        Parameters:
+            maze: The maze which owns the tile buffer.
+            row: The index of the row to view.
+        """
+        self._maze = maze
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._maze.get_dimensions()[1]
+
+    def __getitem__(self, col: int) -> Tile:
+        return self._maze.get_tile((self._row, col))
+
+    def __str__(self) -> str:
+        return ''.join([tile.get_id() for tile in self])
+
+    def __repr__(self) -> str:
+        return f"MazeRow({self._row})"
+
+
 class Maze:
     """ Models a single map for one level. Only includes ground information,
-        excluding information about entities. """
+        excluding information about entities.
+
+        Tiles are stored compactly as one byte per cell. Walls, empty squares
+        and lava are shared flyweight instances; only doors, which have state,
+        get a Tile instance of their own.
+    """
     TILES = {
         WALL: Wall,
         EMPTY: Empty,
@@ -361,6 +495,30 @@ class Maze:
         LAVA: Lava,
     }
 
+    # Shared instances for the stateless tiles, keyed by their byte code
+    FLYWEIGHTS = {
+        ord(WALL): Wall(),
+        ord(EMPTY): Empty(),
+        ord(LAVA): Lava(),
+    }
+
+    # Maps every byte to the tile code stored for it. If there is an entity in
+    # a spot, assume the ground underneath is empty
+    _CODES = bytes([
+        code if chr(code) in (WALL, EMPTY, DOOR, LAVA) else ord(EMPTY)
+        for code in range(256)
+    ])
+
+    # Map tile codes to 1 if the tile can be walked on, with the doors locked
+    # or unlocked, and to the damage done or 1 if it is an exit
+    _OPEN = bytes([0 if chr(code) in (WALL, DOOR) else 1
+                   for code in range(256)])
+    _OPEN_UNLOCKED = bytes([0 if chr(code) == WALL else 1
+                            for code in range(256)])
+    _DAMAGE = bytes([LAVA_DAMAGE if chr(code) == LAVA else 0
+                     for code in range(256)])
+    _EXITS = bytes([1 if chr(code) == DOOR else 0 for code in range(256)])
+
     def __init__(self, dimensions: tuple[int, int]) -> None:
         """Sets up an empty maze of given dimensions.
         
@@ -368,33 +526,200 @@ class Maze:
             dimensions: (#rows, #columns)
         """
         self._dimensions = dimensions
-        self._tiles = []
+        self._cells = bytearray(EMPTY.encode()) * (dimensions[0] * dimensions[1])
+        self._num_rows = 0
+        self._rows = [] # Views of each row, returned by get_tiles
+        self._doors = {} # Maps positions to Door instances
+        self._doors_unlocked = False
+        # Maps whether the doors are unlocked to the move tables for that
+        # state; shared with copies, as they have the same layout
+        self._move_tables = {}
+
+    @classmethod
+    def from_cells(
+        cls,
+        dimensions: tuple[int, int],
+        cells: Union[bytes, bytearray, memoryview],
+        door_positions: Optional[Iterable[tuple[int, int]]] = None
+    ) -> 'Maze':
+        """ Creates a complete maze directly from a buffer of tile codes. The
+            buffer is used as is, without being copied.
+
+        Parameters:
+            dimensions: (#rows, #columns)
+            cells: One tile code per cell, in row-major order.
+            door_positions: The positions of the doors in cells, if known.
+                Otherwise the buffer is searched for them.
+        """
+        maze = cls((0, 0))
+        maze._dimensions = dimensions
+        maze._cells = cells
+        maze._num_rows = dimensions[0]
+        if door_positions is None:
+            codes = cells if hasattr(cells, 'find') else bytes(cells)
+            num_cols = dimensions[1]
+            door_positions = []
+            index = codes.find(DOOR.encode())
+            while index != -1:
+                door_positions.append(divmod(index, num_cols))
+                index = codes.find(DOOR.encode(), index + 1)
+        for position in door_positions:
+            maze._doors[tuple(position)] = Door()
+        return maze
     
     def get_dimensions(self) -> tuple[int, int]:
         """ Returns the dimensions of this maze. """
         return self._dimensions
+
+    def copy(self) -> 'Maze':
+        """ Returns a copy of this maze with its own door state. The tile
+            buffer, which never changes once the maze is complete, is shared
+            rather than copied.
+        """
+        maze = Maze.from_cells(self._dimensions, self._cells, self._doors)
+        maze._num_rows = self._num_rows
+        maze._move_tables = self._move_tables
+        if self._doors_unlocked:
+            maze.unlock_door()
+        return maze
+
+    def get_cells(self) -> Union[bytes, bytearray, memoryview]:
+        """ Returns the buffer of tile codes for this maze, one byte per cell in
+            row-major order.
+        """
+        return self._cells
+
+    def get_num_rows(self) -> int:
+        """ Returns the number of rows that have been added to this maze. """
+        return self._num_rows
     
     def add_row(self, row: str) -> None:
-        """ Adds a row of tiles to the maze.
+        """ Adds a row of tiles to the maze. Rows past the maze's number of rows
+            are ignored, and columns past its number of columns are dropped.
         
         Parameters:
             row: String of the tile IDs from which to construct Tile instances.
         """
-        # If there is an entity in a spot, assume the ground underneath is empty
-        self._tiles.append([self.TILES.get(tile, Empty)() for tile in row])
-
-    def get_tiles(self) -> list[list[Tile]]:
-        """ Returns the Tile instances in this maze. Each element is a row of
-            Tile instances in order.
+        num_rows, num_cols = self._dimensions
+        if self._num_rows >= num_rows:
+            return
+        codes = row.encode('latin-1', 'replace').translate(self._CODES)
+        codes = codes[:num_cols].ljust(num_cols, EMPTY.encode())
+        start = self._num_rows * num_cols
+        self._cells[start:start + num_cols] = codes
+        self._move_tables = {}
+
+        col = codes.find(DOOR.encode())
+        while col != -1:
+            self._doors[(self._num_rows, col)] = Door()
+            col = codes.find(DOOR.encode(), col + 1)
+        self._num_rows += 1
+
+    def get_tiles(self) -> list[MazeRow]:
+        """ Returns the Tile instances in this maze. Each element is a view of
+            a row of Tile instances in order. The same list is returned until
+            another row is added.
         """
-        return self._tiles
+        if len(self._rows) != self._num_rows:
+            self._rows = [MazeRow(self, row) for row in range(self._num_rows)]
+        return self._rows
     
+    def get_door_positions(self) -> list[tuple[int, int]]:
+        """ Returns the (row, column) positions of all doors in the maze. """
+        return list(self._doors)
+
+    def doors_unlocked(self) -> bool:
+        """ Returns True iff the doors in this maze have been unlocked. """
+        return self._doors_unlocked
+
     def unlock_door(self) -> None:
         """ Unlocks any doors that exist in the maze. """
-        for row in self._tiles:
-            for tile in row:
-                if isinstance(tile, Door):
-                    tile.unlock()
+        for door in self._doors.values():
+            door.unlock()
+        self._doors_unlocked = True
+
+    def get_move_tables(self) -> tuple[bytes, bytes, bytes]:
+        """ Returns flat tables with one entry per cell in row-major order, for
+            moving without looking up Tile instances:
+                moves: For each direction in MOVE_BITS, its bit is set if the
+                    move from the cell lands on a tile that can be walked on,
+                    and that bit shifted up by MOVE_OFF_GRID_SHIFT is set if
+                    the move leaves the grid.
+                damage: The extra damage done by stepping onto the cell.
+                exits: 1 if leaving the grid from the cell completes the level.
+
+            The tables follow unlock_door; they are built once per layout and
+            door state and shared by copies of this maze.
+        """
+        tables = self._move_tables.get(self._doors_unlocked)
+        if tables is None:
+            locked = self._move_tables.get(False)
+            if self._doors_unlocked and locked is not None:
+                tables = self._unlock_move_tables(*locked)
+            else:
+                tables = self._build_move_tables()
+            self._move_tables[self._doors_unlocked] = tables
+        return tables
+
+    def _build_move_tables(self) -> tuple[bytes, bytes, bytes]:
+        """ Builds the move tables for the current door state from the tile
+            codes. Each table is handled as one big integer with a byte per
+            cell, so neighbours are found by shifting rather than per cell.
+        """
+        num_rows, num_cols = self._dimensions
+        size = num_rows * num_cols
+        codes = bytes(self._cells)
+        if size == 0:
+            return b'', b'', b''
+
+        def as_int(cells: bytes) -> int:
+            return int.from_bytes(cells, 'little')
+
+        open_codes = self._OPEN_UNLOCKED if self._doors_unlocked else self._OPEN
+        passable = as_int(codes.translate(open_codes))
+        every_cell = as_int(b'\x01' * size)
+        first_row = as_int(b'\x01' * num_cols)
+        last_row = first_row << (8 * (size - num_cols))
+        first_col = as_int((b'\x01' + bytes(num_cols - 1)) * num_rows)
+        last_col = first_col << (8 * (num_cols - 1))
+
+        # Byte i of each neighbour table holds whether cell i's neighbour in
+        # that direction can be walked on
+        neighbours = {
+            (-1, 0): (passable << (8 * num_cols)) & every_cell,
+            (1, 0): passable >> (8 * num_cols),
+            (0, -1): (passable << 8) & (every_cell ^ first_col),
+            (0, 1): (passable >> 8) & (every_cell ^ last_col),
+        }
+        edges = {(-1, 0): first_row, (1, 0): last_row,
+                 (0, -1): first_col, (0, 1): last_col}
+        moves = 0
+        for delta, bit in MOVE_BITS.items():
+            shift = bit.bit_length() - 1
+            moves |= neighbours[delta] << shift
+            moves |= edges[delta] << (shift + MOVE_OFF_GRID_SHIFT)
+
+        return (moves.to_bytes(size, 'little'), codes.translate(self._DAMAGE),
+                codes.translate(self._EXITS))
+
+    def _unlock_move_tables(self, moves: bytes, damage: bytes, exits: bytes
+                            ) -> tuple[bytes, bytes, bytes]:
+        """ Returns the move tables with the doors unlocked, given those with
+            them locked, by opening the moves into each door's neighbours.
+        """
+        num_rows, num_cols = self._dimensions
+        moves = bytearray(moves)
+        for row, col in self._doors:
+            index = row * num_cols + col
+            if row > 0:
+                moves[index - num_cols] |= MOVE_BITS[(1, 0)]
+            if row < num_rows - 1:
+                moves[index + num_cols] |= MOVE_BITS[(-1, 0)]
+            if col > 0:
+                moves[index - 1] |= MOVE_BITS[(0, 1)]
+            if col < num_cols - 1:
+                moves[index + 1] |= MOVE_BITS[(0, -1)]
+        return bytes(moves), damage, exits
     
     def get_tile(self, position: tuple[int, int]) -> Tile:
         """ Returns the Tile instance at the given position.
@@ -403,14 +728,50 @@ class Maze:
             position: The (row, column) position from which to find the tile.
         """
         row, col = position
-        return self._tiles[row][col]
+        num_rows, num_cols = self._num_rows, self._dimensions[1]
+        # Negative indices count back from the end, as with nested lists
+        if row < 0:
+            row += num_rows
+        if col < 0:
+            col += num_cols
+        if not (0 <= row < num_rows and 0 <= col < num_cols):
+            raise IndexError(f"position {position} is outside the maze")
+
+        code = self._cells[row * num_cols + col]
+        tile = self.FLYWEIGHTS.get(code)
+        if tile is None:
+            tile = self._doors[(row, col)]
+        return tile
     
     def __str__(self) -> str:
         """ Returns the string representation of this maze. """
-        return '\n'.join(
-            [''.join([tile.get_id() for tile in row]) for row in self._tiles]
-        )
+        num_cols = self._dimensions[1]
+        rows = [
+            str(self._cells[start:start + num_cols], 'latin-1')
+            for start in range(0, self._num_rows * num_cols, num_cols)
+        ]
+        for (row, col), door in self._doors.items():
+            if not door.is_blocking():
+                rows[row] = rows[row][:col] + door.get_id() + rows[row][col + 1:]
+        return '\n'.join(rows)
     
+    def __getstate__(self) -> dict:
+        """ Returns the state to pickle, copying the tile codes out of any
+            memory-mapped buffer.
+        """
+        state = self.__dict__.copy()
+        state['_rows'] = []
+        state['_move_tables'] = {}
+        if isinstance(self._cells, memoryview):
+            state['_cells'] = bytes(self._cells)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """ Restores a pickled maze, defaulting what older pickles lack. """
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_rows', [])
+        self.__dict__.setdefault('_move_tables', {})
+
     def __repr__(self) -> str:
         """ Returns the computer representation of this maze. """
         return f"Maze({self._dimensions})"
@@ -426,15 +787,81 @@ class Level:
         WATER: Water,
     }
 
-    def __init__(self, dimensions: tuple[int, int]) -> None:
+    def __init__(self, dimensions: tuple[int, int],
+                 maze: Optional[Maze] = None) -> None:
         """ Sets up a new level with empty maze and no items or player.
         
         Parameters:
             dimensions: The (#rows, #columns) in the maze for this level.
+            maze: A complete maze to use instead of a new empty one.
         """
-        self._maze = Maze(dimensions)
+        self._maze = Maze(dimensions) if maze is None else maze
         self._items = {} # Maps positions to Item instances
+        self._num_coins = 0
+        self._owns_items = True # False while _items is shared with a copy
         self._player_start = None
+        self._item_codes = None # Item id byte per cell, once asked for
+
+    def copy(self) -> 'Level':
+        """ Returns a copy of this level which can be played independently.
+
+            The maze layout is shared and the items are copied on write, so a
+            copy costs time proportional to the number of doors rather than the
+            size of the maze.
+        """
+        level = Level(self.get_dimensions(), self._maze.copy())
+        level._items = self._items
+        level._num_coins = self._num_coins
+        level._player_start = self._player_start
+        level._owns_items = self._owns_items = False
+        return level
+
+    def __setstate__(self, state: dict) -> None:
+        """ Restores a pickled level, defaulting what older pickles lack. """
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_owns_items', True)
+        self.__dict__.setdefault('_item_codes', None)
+
+    def _own_items(self) -> None:
+        """ Takes a private copy of the items before they are changed, if they
+            are still shared with another copy of this level.
+        """
+        if not self._owns_items:
+            self._items = dict(self._items)
+            self._owns_items = True
+
+    def get_item_codes(self) -> bytearray:
+        """ Returns a buffer holding the id byte of the item in each cell, or 0
+            for no item, in row-major order. The same buffer is kept up to date
+            as items change, so views of it stay current.
+        """
+        if self._item_codes is None:
+            num_rows, num_cols = self.get_dimensions()
+            self._item_codes = bytearray(num_rows * num_cols)
+            self._write_item_codes()
+        return self._item_codes
+
+    def _write_item_codes(self) -> None:
+        """ Writes every item into the item code buffer, in place. """
+        codes = self._item_codes
+        num_rows, num_cols = self.get_dimensions()
+        codes[:] = bytes(len(codes))
+        for (row, col), item in self._items.items():
+            if 0 <= row < num_rows and 0 <= col < num_cols:
+                codes[row * num_cols + col] = ord(item.get_id())
+
+    def _set_item_code(self, position: tuple[int, int], code: int) -> None:
+        """ Updates one cell of the item code buffer, if there is one.
+
+        Parameters:
+            position: The (row, column) position of the cell.
+            code: The id byte of the item now there, or 0 for none.
+        """
+        if self._item_codes is not None:
+            num_rows, num_cols = self.get_dimensions()
+            row, col = position
+            if 0 <= row < num_rows and 0 <= col < num_cols:
+                self._item_codes[row * num_cols + col] = code
     
     def get_maze(self) -> Maze:
         """ Returns the Maze instance for this level. """
@@ -442,22 +869,32 @@ class Level:
     
     def _contains_coins(self) -> bool:
         """ Returns True iff there are any more coins left in this level. """
-        return any([item.get_id() == COIN for item in self._items.values()])
+        return self._num_coins > 0
 
-    def attempt_unlock_door(self) -> None:
-        """ Unlocks the doors in the maze if there are no coins remaining. """
-        if not self._contains_coins():
+    def attempt_unlock_door(self) -> bool:
+        """ Unlocks the doors in the maze if there are no coins remaining.
+
+        Returns:
+            True iff the doors were unlocked by this call.
+        """
+        if not self._contains_coins() and not self._maze.doors_unlocked():
             self._maze.unlock_door()
+            return True
+        return False
     
     def add_row(self, row: str) -> None:
-        """ Adds the tiles and entities from the row to this level.
+        """ Adds the tiles and entities from the row to this level, within the
+            level's dimensions as for Maze.add_row.
         
         Parameters:
             row: A string of tile or entity IDs.
         """
-        row_num = len(self._maze.get_tiles())
+        num_rows, num_cols = self.get_dimensions()
+        row_num = self._maze.get_num_rows()
+        if row_num >= num_rows:
+            return
         self._maze.add_row(row)
-        for col_num, char in enumerate(row):
+        for col_num, char in enumerate(row[:num_cols]):
             self.add_entity((row_num, col_num), char)
     
     def add_entity(self, position: tuple[int, int], entity_id: str) -> None:
@@ -468,7 +905,7 @@ class Level:
             entity_id: The ID of the entity to add.
         """
         if self.ENTITIES.get(entity_id) is not None:
-            self._items[position] = self.ENTITIES.get(entity_id)(position)
+            self._set_item(position, self.ENTITIES.get(entity_id)(position))
         if entity_id == PLAYER:
             self.add_player_start(position)
 
@@ -482,6 +919,37 @@ class Level:
         """
         return self._items
 
+    def set_items(self, items: dict[tuple[int, int], Item]) -> None:
+        """ Replaces all items in this level, e.g. when restoring a saved game.
+
+        Parameters:
+            items: Maps positions to the Item at that position.
+        """
+        self._items = dict(items)
+        self._owns_items = True
+        self._num_coins = sum(
+            1 for item in self._items.values() if item.get_id() == COIN
+        )
+        if self._item_codes is not None:
+            self._write_item_codes()
+
+    def _set_item(self, position: tuple[int, int], item: Item) -> None:
+        """ Places an item at the given position, keeping the coin count up to
+            date.
+
+        Parameters:
+            position: The (row, column) position at which to place the item.
+            item: The item to place.
+        """
+        self._own_items()
+        old_item = self._items.get(position)
+        if old_item is not None and old_item.get_id() == COIN:
+            self._num_coins -= 1
+        if item.get_id() == COIN:
+            self._num_coins += 1
+        self._items[position] = item
+        self._set_item_code(position, ord(item.get_id()))
+
     def remove_item(self, position: tuple[int, int]) -> None:
         """ Deletes the item from the given position.
         
@@ -491,7 +959,10 @@ class Level:
         Parameters:
             position: the (row, column) position from which to delete an item.
         """
-        del self._items[position]
+        self._own_items()
+        if self._items.pop(position).get_id() == COIN:
+            self._num_coins -= 1
+        self._set_item_code(position, 0)
     
     def add_player_start(self, position: tuple[int, int]) -> None:
         """ Adds the start position for the player in this level.
@@ -515,21 +986,280 @@ class Level:
         return f"Level({self.get_dimensions()})"
 
 
+class MoveSummary:
+    """ The result of applying a sequence of moves with Model.apply_moves. """
+    WON = 'won'
+    LOST = 'lost'
+    LEVEL_UP = 'level_up'
+
+    def __init__(self, positions: list[tuple[int, int]],
+                 stats: tuple[int, int, int],
+                 collected: list[tuple[tuple[int, int], Item]],
+                 outcome: Optional[str]) -> None:
+        """ Records the result of applying some moves.
+
+        Parameters:
+            positions: The player's position after each move that was made.
+            stats: The player's (HP, hunger, thirst) after the last move.
+            collected: The (position, item) of each item collected, in order.
+            outcome: WON, LOST or LEVEL_UP if that stopped the moves early, or
+                None if every move was made.
+        """
+        self.positions = positions
+        self.stats = stats
+        self.collected = collected
+        self.outcome = outcome
+
+    def get_num_moves(self) -> int:
+        """ Returns the number of moves that were made. """
+        return len(self.positions)
+
+    def __repr__(self) -> str:
+        return (f"MoveSummary({len(self.positions)} moves, {self.stats}, "
+                f"{len(self.collected)} items, {self.outcome!r})")
+
+
+# Tags for the parts of a game state hashed by Model.state_hash
+(_HASH_LEVEL, _HASH_ITEM, _HASH_DOORS, _HASH_WON, _HASH_INVENTORY,
+ _HASH_POSITION, _HASH_HEALTH, _HASH_HUNGER, _HASH_THIRST,
+ _HASH_MOVES) = range(1, 11)
+_HASH_MASK = (1 << 64) - 1
+# The most Zobrist keys kept for reuse. The move count's keys are never kept,
+# as each is only needed once per game
+_ZOBRIST_CACHE_SIZE = 1 << 14
+
+
+def _mix_key(parts: tuple[int, ...]) -> int:
+    """ Returns the 64-bit key mixed from the parts with SplitMix64. """
+    key = 0
+    for part in parts:
+        key = (key ^ part) + 0x9E3779B97F4A7C15 & _HASH_MASK
+        key = (key ^ key >> 30) * 0xBF58476D1CE4E5B9 & _HASH_MASK
+        key = (key ^ key >> 27) * 0x94D049BB133111EB & _HASH_MASK
+        key ^= key >> 31
+    return key
+
+
+@lru_cache(maxsize=_ZOBRIST_CACHE_SIZE)
+def _zobrist_key(*parts: int) -> int:
+    """ Returns the 64-bit Zobrist key for one fact about a game state, such as
+        (_HASH_ITEM, row, column, item id byte).
+
+        Keys are mixed from the parts with SplitMix64 rather than drawn at
+        random, so they are the same in every run and hashes can be saved.
+        The most recently used keys are cached.
+    """
+    return _mix_key(parts)
+
+
+def merge_events(events: list[tuple[str, Any]]) -> list[tuple[str, Any]]:
+    """ Merges a sequence of model change events into their net effect.
+
+    Parameters:
+        events: The (kind, data) events in the order they happened.
+
+    Returns:
+        The merged events: one PLAYER_MOVED from the first old position to the
+        last new one, the last STATS_CHANGED, one INVENTORY_CHANGED per item
+        with a net change, and every other event in order.
+    """
+    merged = []
+    moved = None
+    stats = None
+    inventory = {}
+    for kind, data in events:
+        if kind == PLAYER_MOVED:
+            moved = (data[0] if moved is None else moved[0], data[1])
+        elif kind == STATS_CHANGED:
+            stats = data
+        elif kind == INVENTORY_CHANGED:
+            name, item_id, delta, count = data
+            old_delta = inventory.get(name, (None, None, 0))[2]
+            inventory[name] = (name, item_id, old_delta + delta, count)
+        else:
+            merged.append((kind, data))
+
+    if moved is not None and moved[0] != moved[1]:
+        merged.append((PLAYER_MOVED, moved))
+    if stats is not None:
+        merged.append((STATS_CHANGED, stats))
+    merged.extend((INVENTORY_CHANGED, data) for data in inventory.values()
+                  if data[2] != 0)
+    return merged
+
+
 class Model:
     """ The overall model for a game of MazeRunner """
-    def __init__(self, game_file: str) -> None:
+    def __init__(self, game_file: str, lazy: bool = True,
+                 drop_finished: bool = False,
+                 cache: Optional['LevelCache'] = None) -> None:
         """ Constructs a new game.
         
         Parameters:
-            game_file: The file containing the levels for this game.
+            game_file: The file containing the levels for this game. Files
+                compiled to the .mzb format are memory-mapped instead of parsed.
+            lazy: If True, each level is only parsed once the game reaches it.
+            drop_finished: If True (and lazy), levels are discarded once they
+                have been completed.
+            cache: A LevelCache to take already parsed levels from.
         """
-        self._levels = load_game(game_file)
+        if cache is not None:
+            self._levels = cache.get_levels(game_file)
+        elif game_file.endswith('.mzb'):
+            from mzb import CompiledLevels  # mzb imports this module
+            self._levels = CompiledLevels(game_file)
+        elif lazy:
+            self._levels = LazyLevels(game_file)
+        else:
+            self._levels = load_game(game_file)
+        self._drop_finished = drop_finished and hasattr(self._levels, 'release')
         self._level_num = 0
         self._player = Player(self.get_level().get_player_start())
         self._won = False
         self._did_level_up = False
         self._num_moves = 0
         self._game_file = game_file
+        self._subscribers = []
+        self._batch_depth = 0
+        self._pending_events = []
+        # The Zobrist hashes of the current level and of the inventory, kept
+        # up to date as they change
+        self._level_hash = 0
+        self._inventory_hash = 0
+        self.rehash()
+
+    def close(self) -> None:
+        """ Releases the file the levels are read from, if any is held open,
+            such as a memory-mapped .mzb file. Call once the game is no longer
+            needed; its levels can then no longer be loaded.
+        """
+        close = getattr(self._levels, 'close', None)
+        if close is not None:
+            close()
+
+    def subscribe(self, callback: Callable[[list[tuple[str, Any]]], None]
+                  ) -> None:
+        """ Registers a callback to be notified of changes to the game.
+
+        The callback is given a list of (kind, data) events, where the kinds
+        and their data are:
+            PLAYER_MOVED: (old position, new position)
+            ITEM_REMOVED: (position, item) for an item taken from the level
+            DOOR_UNLOCKED: the positions of the doors that were unlocked
+            STATS_CHANGED: the player's new (HP, hunger, thirst)
+            INVENTORY_CHANGED: (item name, item id, change in count, new count)
+            LEVEL_CHANGED: the new level number (the game may have been won)
+
+        Parameters:
+            callback: The function to notify of changes.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[list[tuple[str, Any]]], None]
+                    ) -> None:
+        """ Stops notifying a callback registered with subscribe.
+
+        Parameters:
+            callback: The function to stop notifying.
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """ Collects the events from every change made inside the with block and
+            notifies subscribers once at the end, with events merged so each
+            subscriber sees the net change (e.g. a single PLAYER_MOVED).
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_events:
+                events = merge_events(self._pending_events)
+                self._pending_events = []
+                self._notify(events)
+
+    def _emit(self, kind: str, data: Any) -> None:
+        """ Notifies subscribers of a change, or queues it during a batch.
+
+        Parameters:
+            kind: The kind of change event.
+            data: The data for the event.
+        """
+        if not self._subscribers:
+            return
+        if self._batch_depth:
+            self._pending_events.append((kind, data))
+        else:
+            self._notify([(kind, data)])
+
+    def _notify(self, events: list[tuple[str, Any]]) -> None:
+        """ Sends the given events to every subscriber. """
+        for callback in list(self._subscribers):
+            callback(events)
+
+    def _inventory_changed(self, item: Item, delta: int) -> None:
+        """ Updates the inventory hash and notifies subscribers after the count
+            of an item kind has changed.
+
+        Parameters:
+            item: An item of the kind whose count changed.
+            delta: The change in the count.
+        """
+        name, item_id = item.get_name(), item.get_id()
+        count = len(self.get_player_inventory().get_items().get(name, []))
+        for old_or_new in (count - delta, count):
+            if old_or_new:
+                self._inventory_hash ^= _zobrist_key(
+                    _HASH_INVENTORY, ord(item_id), old_or_new)
+        if self._subscribers:
+            self._emit(INVENTORY_CHANGED, (name, item_id, delta, count))
+
+    def _hash_level(self) -> int:
+        """ Returns the Zobrist hash of the level number and the items and
+            doors of the current level.
+        """
+        if self._won:
+            return _zobrist_key(_HASH_WON)
+        level_hash = _zobrist_key(_HASH_LEVEL, self._level_num)
+        for (row, col), item in self.get_level().get_items().items():
+            level_hash ^= _zobrist_key(_HASH_ITEM, row, col, ord(item.get_id()))
+        if self.get_current_maze().doors_unlocked():
+            level_hash ^= _zobrist_key(_HASH_DOORS)
+        return level_hash
+
+    def rehash(self) -> None:
+        """ Recomputes the state hash from scratch, for after the game state
+            has been changed other than through this model, e.g. when loading
+            a saved game.
+        """
+        self._level_hash = self._hash_level()
+        self._inventory_hash = 0
+        for items in self.get_player_inventory().get_items().values():
+            if items:
+                self._inventory_hash ^= _zobrist_key(
+                    _HASH_INVENTORY, ord(items[0].get_id()), len(items))
+
+    def state_hash(self) -> int:
+        """ Returns a 64-bit Zobrist hash of the game state: the level, the
+            items left in it and whether its doors are unlocked, the player's
+            position, stats and inventory counts, and the number of moves made.
+
+            The level and inventory parts are kept up to date as they change,
+            and the few values which change on every move are folded in here,
+            so this takes constant time. Equal states have equal hashes in
+            every run, so hashes can be saved and compared later.
+        """
+        row, col = self._player.get_position()
+        health, hunger, thirst = self.get_player_stats()
+        return (self._level_hash ^ self._inventory_hash
+                ^ _zobrist_key(_HASH_POSITION, row, col)
+                ^ _zobrist_key(_HASH_HEALTH, health)
+                ^ _zobrist_key(_HASH_HUNGER, hunger)
+                ^ _zobrist_key(_HASH_THIRST, thirst)
+                ^ _mix_key((_HASH_MOVES, self._num_moves)))
 
     def has_won(self) -> bool:
         """ Returns True iff the game has been won (i.e. all levels have been
@@ -549,6 +1279,16 @@ class Model:
         """ Returns the current level. """
         return self._levels[self._level_num]
     
+    def get_level_num(self) -> int:
+        """ Returns the index of the current level, which is the number of
+            levels once the game has been won.
+        """
+        return self._level_num
+
+    def get_num_moves(self) -> int:
+        """ Returns the number of moves the player has made. """
+        return self._num_moves
+
     def did_level_up(self) -> True:
         """ Returns True if the player just moved to the next level on the
             previous turn.
@@ -559,17 +1299,75 @@ class Model:
         """ Changes the level to the next level from the file. If no more levels
             remain, the player has won the game.
         """
+        if self._drop_finished:
+            self._levels.release(self._level_num)
         self._level_num += 1
         if self._level_num >= len(self._levels):
             self._won = True
+            if self._drop_finished:
+                # Every level has been dropped, so nothing more is read
+                self.close()
         else:
             self._player.set_position(self.get_level().get_player_start())
             self._did_level_up = True
+        self._level_hash = self._hash_level()
+        self._emit(LEVEL_CHANGED, self._level_num)
 
     def move_player(self, delta: tuple[int, int]) -> None:
         """ Tries to move the player by the requested amount. Levels up if the
             user finishes the maze, """
         self._did_level_up = False
+        old_pos = row, col = self._player.get_position()
+        maze = self.get_current_maze()
+        num_rows, num_cols = maze.get_dimensions()
+        bit = MOVE_BITS.get(delta)
+        if bit is None or not (0 <= row < num_rows and 0 <= col < num_cols):
+            self._move_by_tiles(delta)
+            return
+
+        moves, damage, exits = maze.get_move_tables()
+        index = row * num_cols + col
+        entry = moves[index]
+        if entry & bit:
+            self._step(old_pos, (row + delta[0], col + delta[1]),
+                       damage[index + delta[0] * num_cols + delta[1]])
+        elif entry & (bit << MOVE_OFF_GRID_SHIFT):
+            if exits[index]:
+                self.level_up()
+            else:
+                self._move_by_tiles(delta)
+
+    def _step(self, old_pos: tuple[int, int], position: tuple[int, int],
+              damage: int) -> None:
+        """ Moves the player onto a tile they can walk on and updates stats.
+
+        Parameters:
+            old_pos: The player's position before the move.
+            position: The position to move to.
+            damage: The extra damage done by the tile moved onto.
+        """
+        self._num_moves += 1
+        if self._num_moves % 5 == 0:
+            self._player.change_hunger(1)
+            self._player.change_thirst(1)
+        self._player.change_health(-1 - damage)
+
+        self._player.set_position(position)
+        # Skip building the events' data when no one is listening
+        if self._subscribers:
+            self._emit(PLAYER_MOVED, (old_pos, position))
+            self._emit(STATS_CHANGED, self.get_player_stats())
+        self.attempt_collect_item(position)
+
+    def _move_by_tiles(self, delta: tuple[int, int]) -> None:
+        """ Moves the player by looking up tiles rather than the move tables,
+            for moves other than a single step from inside the grid or off the
+            grid other than through a door, which wrap round to the far side
+            as negative indices do.
+
+        Parameters:
+            delta: The requested change in position.
+        """
         old_pos = self._player.get_position()
         position = row, col = old_pos[0] + delta[0], old_pos[1] + delta[1]
         max_row, max_col = self.get_level().get_dimensions()
@@ -583,16 +1381,122 @@ class Model:
         else:
             tile = self.get_current_maze().get_tile(position)
             if not tile.is_blocking():
-                self._num_moves += 1
-        
-                if self._num_moves % 5 == 0:
-                    self._player.change_hunger(1)
-                    self._player.change_thirst(1)
-                self._player.change_health(-1 - tile.damage())
-
-                self._player.set_position(position)
-                self.attempt_collect_item(position)
+                self._step(old_pos, position, tile.damage())
     
+    def apply_moves(self, moves: str) -> MoveSummary:
+        """ Applies a sequence of moves, with the same effect as calling
+            move_player for each in turn, stopping early if the game is won or
+            lost or the player moves up a level.
+
+        Parameters:
+            moves: Move keys from MOVE_DELTAS, e.g. 'wwddsa'.
+
+        Returns:
+            A summary of the positions, stats and items collected.
+
+        Raises:
+            ValueError: If a move is not a move key; no moves are made.
+        """
+        try:
+            deltas = [MOVE_DELTAS[move] for move in moves]
+        except KeyError as error:
+            raise ValueError(f'Invalid move: {error.args[0]!r}') from None
+
+        positions = []
+        collected = []
+        player = self._player
+        if self._won or self.has_lost():
+            return MoveSummary(positions, self.get_player_stats(), collected,
+                               self._outcome())
+
+        level = self.get_level()
+        maze = level.get_maze()
+        moves_table, damage, _ = maze.get_move_tables()
+        items = level.get_items()
+        max_row, max_col = level.get_dimensions()
+        emit = self._emit if self._subscribers else None
+        change_health = player.change_health
+        get_health, get_hunger = player.get_health, player.get_hunger
+        get_thirst = player.get_thirst
+        row, col = player.get_position()
+        outcome = None
+        # Only collecting a coin can unlock the doors after the first move
+        check_doors = not maze.doors_unlocked()
+
+        for d_row, d_col in deltas:
+            bit = MOVE_BITS[(d_row, d_col)]
+            if 0 <= row < max_row and 0 <= col < max_col:
+                index = row * max_col + col
+                entry = moves_table[index]
+            else:
+                entry = bit << MOVE_OFF_GRID_SHIFT
+
+            if not entry & bit:
+                if entry & (bit << MOVE_OFF_GRID_SHIFT):
+                    # Leaving the maze or wrapping round to its far side
+                    self.move_player((d_row, d_col))
+                    row, col = player.get_position()
+                    outcome = self._outcome()
+                else:
+                    self._did_level_up = False
+                positions.append((row, col))
+                if outcome is not None:
+                    break
+                continue
+
+            self._did_level_up = False
+            self._num_moves += 1
+            if self._num_moves % 5 == 0:
+                player.change_hunger(1)
+                player.change_thirst(1)
+            change_health(-1 - damage[index + d_row * max_col + d_col])
+
+            position = row, col = (row + d_row, col + d_col)
+            player.set_position(position)
+            if emit:
+                emit(PLAYER_MOVED, ((row - d_row, col - d_col), position))
+                emit(STATS_CHANGED, self.get_player_stats())
+            positions.append(position)
+
+            item = items.get(position)
+            if item is not None:
+                player.add_item(item)
+                level.remove_item(position)
+                items = level.get_items()
+                collected.append((position, item))
+                self._level_hash ^= _zobrist_key(_HASH_ITEM, row, col,
+                                                 ord(item.get_id()))
+                if emit:
+                    emit(ITEM_REMOVED, (position, item))
+                self._inventory_changed(item, 1)
+                check_doors = not maze.doors_unlocked()
+            if check_doors:
+                if level.attempt_unlock_door():
+                    moves_table = maze.get_move_tables()[0]
+                    self._level_hash ^= _zobrist_key(_HASH_DOORS)
+                    if emit:
+                        emit(DOOR_UNLOCKED, maze.get_door_positions())
+                check_doors = False
+
+            if get_health() <= 0 or get_hunger() >= MAX_HUNGER \
+                    or get_thirst() >= MAX_THIRST:
+                outcome = MoveSummary.LOST
+                break
+
+        return MoveSummary(positions, self.get_player_stats(), collected,
+                           outcome)
+
+    def _outcome(self) -> Optional[str]:
+        """ Returns the MoveSummary outcome that stops further moves, if any.
+        """
+        if self._won:
+            return MoveSummary.WON
+        if self.has_lost():
+            return MoveSummary.LOST
+        if self._did_level_up:
+            return MoveSummary.LEVEL_UP
+        return None
+
     def attempt_collect_item(self, position: tuple[int, int]) -> None:
         """ Collect the item at the given position if one exists. Unlock door if
             all coins have been collected.
@@ -604,7 +1508,54 @@ class Model:
         if item is not None:
             self._player.add_item(item)
             self.get_level().remove_item(position)
-        self.get_level().attempt_unlock_door()
+            self._level_hash ^= _zobrist_key(_HASH_ITEM, *position,
+                                             ord(item.get_id()))
+            self._emit(ITEM_REMOVED, (position, item))
+            self._inventory_changed(item, 1)
+        if self.get_level().attempt_unlock_door():
+            self._level_hash ^= _zobrist_key(_HASH_DOORS)
+            self._emit(DOOR_UNLOCKED,
+                       self.get_current_maze().get_door_positions())
+
+    def add_inventory_item(self, item: Item) -> None:
+        """ Adds an item to the player's inventory.
+
+        Parameters:
+            item: The item to add.
+        """
+        self._player.add_item(item)
+        self._inventory_changed(item, 1)
+
+    def remove_inventory_item(self, item_name: str) -> Optional[Item]:
+        """ Removes one item with the given name from the player's inventory.
+
+        Parameters:
+            item_name: The name of the item to remove.
+
+        Returns:
+            The removed item, or None if the player has no such item.
+        """
+        item = self.get_player_inventory().remove_item(item_name)
+        if item is not None:
+            self._inventory_changed(item, -1)
+        return item
+
+    def use_item(self, item_name: str) -> bool:
+        """ Removes one item with the given name from the player's inventory
+            and applies it to the player.
+
+        Parameters:
+            item_name: The name of the item to use.
+
+        Returns:
+            True iff the player had such an item to use.
+        """
+        item = self.remove_inventory_item(item_name)
+        if item is None:
+            return False
+        item.apply(self._player)
+        self._emit(STATS_CHANGED, self.get_player_stats())
+        return True
         
     def get_player(self) -> Player:
         """ Returns the player in the game. """
@@ -670,6 +1621,20 @@ class MazeRunner:
         Parameters:
             move: The users input from a move prompt.
         """
+        # Invalid; reprompt
+        if not self._apply_move(move):
+            self._user_prompt()
+
+    def _apply_move(self, move: str) -> bool:
+        """ Updates the model for a single move, without prompting, so it can
+            be timed apart from waiting for input.
+
+        Parameters:
+            move: The users input from a move prompt.
+
+        Returns:
+            True iff the move was valid.
+        """
         # Player has attempted to move
         if move in (UP, DOWN, LEFT, RIGHT):
             self._model.move_player(MOVE_DELTAS.get(move))
@@ -677,20 +1642,19 @@ class MazeRunner:
         # Player has attempted to use an item
         elif len(move) > 1 and move.split()[0] == 'i':
             item_name = move.partition(' ')[-1]
-            item = self._model.get_player().get_inventory().remove_item(item_name)
-            if item is not None:
-                item.apply(self._model.get_player())
-            else:
+            if not self._model.use_item(item_name):
                 print('\nNo item with that name!\n')
-    
-        # Invalid; reprompt
+
         else:
-            self._user_prompt()
+            return False
+        return True
 
     def play(self):
         """ Executes the entire game until a win or loss occurs. """
         while True:
             self._redraw()
+            if PROFILER.enabled:
+                print(PROFILER.summary())
             self._user_prompt()
 
             if self._model.has_won():
@@ -702,6 +1666,15 @@ class MazeRunner:
 
 def main():
     """ Entry-point to gameplay """
+    start_profiling([
+        (MazeRunner, '_apply_move'),
+        (Model, 'move_player'),
+        (Model, 'attempt_collect_item'),
+        (TextInterface, 'draw'),
+        (TextInterface, '_draw_level'),
+        (TextInterface, '_draw_inventory'),
+        (TextInterface, '_draw_player_stats'),
+    ])
     view = TextInterface()
     game_file = input('Enter game file: ')
     maze_runner = MazeRunner(game_file, view)
@@ -1,12 +1,16 @@
 import json
 import os
 import sys
+import time
 import tkinter as tk
+from collections import OrderedDict, deque
 from tkinter import messagebox
 from PIL import Image, ImageTk
 
 from a3_support import AbstractGrid
 from a2_solution import *
+from level_cache import LevelCache
+from profiling import PROFILER, start_profiling
 from constants import GAME_FILE, TASK
 from math import *
 from typing import *
@@ -17,21 +21,22 @@ __email__ = "<yanran.li1@uqconnect.edu.au>"
 
 
 # Write your classes here
-class Candy(Food):
-    """ Candy decreases the players hunger. """
-    _id = CANDY
-
-    def apply(self, player: 'Player') -> None:
-        """ Changes player's hunger to 0; Decrease player's health 2. """
-        player._hunger = 0
-        player.change_health(-2)
+class LevelView(AbstractGrid):
+    """The view of level in the game.
 
+    The view is retained between frames: canvas items are kept and only the
+    cells whose door state, item or player occupancy changed are updated.
+    Walls, floor and lava never change during a level, so they are baked into
+    a single image; only doors and entities are drawn on top of it.
 
-class LevelView(AbstractGrid):
-    """The view of level in the game."""
+    Mazes too large to show with cells of at least the minimum cell size are
+    shown through a scrolling viewport: a camera follows the player and only
+    the visible cells are drawn.
+    """
 
     def __init__(self, master: Union[tk.Tk, tk.Frame],
-                 dimensions: tuple[int, int], size: tuple[int, int], **kwargs):
+                 dimensions: tuple[int, int], size: tuple[int, int],
+                 min_cell_size: int = MIN_CELL_SIZE, **kwargs):
         """
         Set up the level.
 
@@ -39,8 +44,175 @@ class LevelView(AbstractGrid):
             master: The master frame for this Canvas.
             dimensions: (#rows, #columns)
             size: (width in pixels, height in pixels)
+            min_cell_size: The smallest cell width and height in pixels before
+                the view scrolls instead of shrinking cells.
         """
+        self._min_cell_size = min_cell_size
+        self._camera = (0, 0)  # The (row, column) shown at the top left
         super().__init__(master, dimensions, size, **kwargs)
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forgets every canvas item drawn so far."""
+        self._tiles = None  # The tiles the current canvas items were drawn for
+        self._static_layer = None  # Image of the tiles which never change
+        self._door_cells = {}  # Maps door positions to (canvas id, tile id)
+        self._item_cells = {}  # Maps item positions to (item id, canvas ids)
+        self._player_ids = []
+        self._player_pos = None
+
+    def set_dimensions(self, dimensions: tuple[int, int]) -> None:
+        """Sets the dimensions of the grid, forcing a full redraw."""
+        super().set_dimensions(dimensions)
+        self._tiles = None
+
+    def clear(self) -> None:
+        """Clears the canvas and all retained canvas items."""
+        super().clear()
+        self._reset()
+
+    def get_cell_size(self) -> tuple[int, int]:
+        """Returns the size of the cells (width, height) in pixels. Cells are
+        square, as large as fits the whole grid but at least the minimum cell
+        size."""
+        width, height = super().get_cell_size()
+        size = max(min(width, height), self._min_cell_size)
+        return size, size
+
+    def get_view_size(self) -> tuple[int, int]:
+        """Returns the (#rows, #columns) of cells visible at once."""
+        rows, cols = self._dimensions
+        cell_width, cell_height = self.get_cell_size()
+        width, height = self._size
+        return min(rows, height // cell_height), min(cols, width // cell_width)
+
+    def is_visible(self, position: tuple[int, int]) -> bool:
+        """Returns True iff the cell at the given position is in view."""
+        top, left = self._camera
+        view_rows, view_cols = self.get_view_size()
+        return top <= position[0] < top + view_rows and \
+            left <= position[1] < left + view_cols
+
+    def get_bbox(self, position: tuple[int, int]) -> tuple[int, int, int, int]:
+        """Returns the bounding box of the position relative to the camera."""
+        top, left = self._camera
+        return super().get_bbox((position[0] - top, position[1] - left))
+
+    def get_midpoint(self, position: tuple[int, int]) -> tuple[int, int]:
+        """Returns the centre of the position relative to the camera."""
+        top, left = self._camera
+        return super().get_midpoint((position[0] - top, position[1] - left))
+
+    def _follow(self, player_pos: tuple[int, int]) -> tuple[int, int]:
+        """
+        Returns the camera position needed to keep the player in view. The
+        camera only moves once the player gets within a quarter of the view
+        of its edge, and then recentres on the player.
+
+        Parameters:
+            player_pos: The current position of the player
+        """
+        camera = []
+        for pos, start, view, total in zip(player_pos, self._camera,
+                                           self.get_view_size(),
+                                           self._dimensions):
+            margin = view // 4
+            if pos < start + margin or pos >= start + view - margin:
+                start = pos - view // 2
+            camera.append(max(0, min(start, total - view)))
+        return tuple(camera)
+
+    def _visible_items(self, items: dict[tuple[int, int], Item]
+                       ) -> list[tuple[tuple[int, int], Item]]:
+        """
+        Returns the (position, item) pairs for the items in view.
+
+        Parameters:
+            items: Maps locations to the items currently at those locations.
+        """
+        top, left = self._camera
+        view_rows, view_cols = self.get_view_size()
+        if len(items) <= view_rows * view_cols:
+            return [(position, item) for position, item in items.items()
+                    if self.is_visible(position)]
+        return [((row, column), items[(row, column)])
+                for row in range(top, top + view_rows)
+                for column in range(left, left + view_cols)
+                if (row, column) in items]
+
+    def _create_tile(self, position: tuple[int, int], tile_id: str) -> int:
+        """
+        Creates the canvas item for one tile.
+
+        Parameters:
+            position: The (row, column) position of the tile.
+            tile_id: The id of the tile to draw.
+
+        Returns:
+            The id of the new canvas item.
+        """
+        x_min, y_min, x_max, y_max = self.get_bbox(position)
+        return self.create_rectangle(x_min, y_min, x_max, y_max,
+                                     fill=TILE_COLOURS[tile_id])
+
+    def _configure_tile(self, canvas_id: int, position: tuple[int, int],
+                        tile_id: str) -> None:
+        """
+        Updates an existing tile canvas item to show a different tile.
+
+        Parameters:
+            canvas_id: The id of the tile's canvas item.
+            position: The (row, column) position of the tile.
+            tile_id: The id of the tile to show.
+        """
+        self.itemconfig(canvas_id, fill=TILE_COLOURS[tile_id])
+
+    def _create_entity(self, position: tuple[int, int],
+                       entity_id: str) -> list[int]:
+        """
+        Creates the canvas items for one item or the player.
+
+        Parameters:
+            position: The (row, column) position of the entity.
+            entity_id: The id of the entity to draw.
+
+        Returns:
+            The ids of the new canvas items.
+        """
+        x_min, y_min, x_max, y_max = self.get_bbox(position)
+        oval = self.create_oval(x_min, y_min, x_max, y_max,
+                                fill=ENTITY_COLOURS[entity_id])
+        text = self.create_text(self.get_midpoint(position), text=entity_id,
+                                font=TEXT_FONT)
+        return [oval, text]
+
+    def _bake_static_layer(self, tile_rows: list[str]) -> tk.PhotoImage:
+        """
+        Renders the static tiles into one image, writing a band of pixel rows
+        for each row of the maze at once.
+
+        Parameters:
+            tile_rows: The id of each static tile, as a string per row.
+
+        Returns:
+            The image of the static tiles, with the grid's outlines.
+        """
+        cell_width, cell_height = self.get_cell_size()
+        outline = '#000000 '
+        cell_pixels = {tile_id: outline + (colour + ' ') * (cell_width - 1)
+                       for tile_id, colour in TILE_COLOURS.items()}
+
+        width = len(tile_rows[0]) * cell_width + 1 if tile_rows else 1
+        layer = tk.PhotoImage(width=width,
+                              height=len(tile_rows) * cell_height + 1)
+        border = '{' + outline * width + '} '
+        for row, tile_ids in enumerate(tile_rows):
+            pixels = '{' + ''.join([cell_pixels[tile_id]
+                                    for tile_id in tile_ids]) + outline + '} '
+            layer.put(border + pixels * (cell_height - 1),
+                      to=(0, row * cell_height))
+        layer.put(border, to=(0, len(tile_rows) * cell_height))
+        return layer
 
     def _draw_level(self, tiles: list[list[Tile]]) -> None:
         """
@@ -49,27 +221,70 @@ class LevelView(AbstractGrid):
         Parameters:
             tiles: The tiles in this level.
         """
-        row_num, col_num = self._dimensions
-        for row in range(row_num):
-            for column in range(col_num):
-                x_min, y_min, x_max, y_max = self.get_bbox((row, column))
-                tile = tiles[row][column].get_id()
-                self.create_rectangle(x_min, y_min, x_max, y_max,
-                                      fill=TILE_COLOURS[tile])
+        top, left = self._camera
+        view_rows, view_cols = self.get_view_size()
+        tile_rows = []
+        doors = []
+        for row in range(top, top + view_rows):
+            tile_ids = []
+            for column in range(left, left + view_cols):
+                tile = tiles[row][column]
+                if isinstance(tile, Door):
+                    # The floor is baked in below each door
+                    doors.append(((row, column), tile.get_id()))
+                    tile_ids.append(EMPTY)
+                else:
+                    tile_ids.append(tile.get_id())
+            tile_rows.append(''.join(tile_ids))
+        self._tiles = tiles
+        # A view too small for a whole cell shows nothing
+        if not view_rows or not view_cols:
+            return
+
+        self._static_layer = self._bake_static_layer(tile_rows)
+        self.create_image(0, 0, image=self._static_layer, anchor=tk.NW)
+        for position, tile_id in doors:
+            self._door_cells[position] = (self._create_tile(position, tile_id),
+                                          tile_id)
+
+    def _draw_doors(self, tiles: list[list[Tile]]) -> None:
+        """
+        Updates any door cells whose tile has changed since the last frame.
+
+        Parameters:
+            tiles: The tiles in this level.
+        """
+        for (row, column), (canvas_id, old_id) in self._door_cells.items():
+            tile_id = tiles[row][column].get_id()
+            if tile_id != old_id:
+                self._configure_tile(canvas_id, (row, column), tile_id)
+                self._door_cells[(row, column)] = (canvas_id, tile_id)
 
     def _draw_items(self, items: dict[tuple[int, int], Item]) -> None:
         """
-        Draw the items in the level.
+        Draw the items in the level, removing any which have been collected.
 
         Parameters:
             items: Maps locations to the items currently at those locations.
         """
-        for position, item in items.items():
-            x_min, y_min, x_max, y_max = self.get_bbox(position)
-            item = item.get_id()
-            self.create_oval(x_min, y_min, x_max, y_max,
-                             fill=ENTITY_COLOURS[item])
-            self.annotate_position(position, item)
+        for position, (item_id, canvas_ids) in list(self._item_cells.items()):
+            item = items.get(position)
+            if item is None or item.get_id() != item_id:
+                self.delete(*canvas_ids)
+                del self._item_cells[position]
+
+        created = False
+        for position, item in self._visible_items(items):
+            if position not in self._item_cells:
+                item_id = item.get_id()
+                self._item_cells[position] = (
+                    item_id, self._create_entity(position, item_id))
+                created = True
+
+        # Keep the player above any newly created items
+        if created and self._player_ids:
+            for canvas_id in self._player_ids:
+                self.tag_raise(canvas_id)
 
     def _draw_player(self, player_pos: tuple[int, int]) -> None:
         """
@@ -78,32 +293,78 @@ class LevelView(AbstractGrid):
         Parameters:
             player_pos: The current position of the player
         """
-        x_min, y_min, x_max, y_max = self.get_bbox(player_pos)
-        self.create_oval(x_min, y_min, x_max, y_max,
-                         fill=ENTITY_COLOURS[PLAYER])
-        self.annotate_position(player_pos, PLAYER)
+        if not self._player_ids:
+            self._player_ids = self._create_entity(player_pos, PLAYER)
+        elif player_pos != self._player_pos:
+            old_x, old_y = self.get_midpoint(self._player_pos)
+            new_x, new_y = self.get_midpoint(player_pos)
+            for canvas_id in self._player_ids:
+                self.move(canvas_id, new_x - old_x, new_y - old_y)
+        self._player_pos = player_pos
 
     def draw(self,
              tiles: list[list[Tile]],
              items: dict[tuple[int, int], Item],
              player_pos: tuple[int, int]) -> None:
         """
-        Clears and redraws the entire level (maze and entities).
+        Draws the level (maze and entities). The whole view is only redrawn
+        when the tiles or dimensions change or the camera moves; otherwise just
+        the changes since the last frame are drawn.
 
         Parameters:
             tiles: The tiles in this level.
             items: Maps locations to the items currently at those locations.
             player_pos: The current position of the player
         """
-        self.clear()
+        camera = self._follow(player_pos)
+        if tiles is not self._tiles or camera != self._camera:
+            self.clear()
+            self._camera = camera
+            self._draw_level(tiles)
+        else:
+            self._draw_doors(tiles)
 
-        self._draw_level(tiles)
         self._draw_items(items)
         self._draw_player(player_pos)
 
+    def move_player(self, player_pos: tuple[int, int],
+                    items: dict[tuple[int, int], Item]) -> None:
+        """
+        Moves the player in the level already drawn, redrawing the visible
+        cells only if the camera has to move to follow them.
+
+        Parameters:
+            player_pos: The new position of the player
+            items: Maps locations to the items currently at those locations.
+        """
+        if self._tiles is None:
+            return
+        camera = self._follow(player_pos)
+        if camera != self._camera:
+            tiles = self._tiles
+            self.clear()
+            self._camera = camera
+            self._draw_level(tiles)
+            self._draw_items(items)
+        self._draw_player(player_pos)
+
+    def remove_item(self, position: tuple[int, int]) -> None:
+        """Removes the item drawn at the given position, if any."""
+        cell = self._item_cells.pop(position, None)
+        if cell is not None:
+            self.delete(*cell[1])
+
+    def update_doors(self) -> None:
+        """Redraws any visible doors whose tile has changed."""
+        if self._tiles is not None:
+            self._draw_doors(self._tiles)
+
 
 class StatsView(AbstractGrid):
-    """The view of player's status."""
+    """The view of player's status.
+
+    The text items are kept between frames and only their text is changed.
+    """
 
     def __init__(self, master: Union[tk.Tk, tk.Frame],
                  width: int, **kwargs) -> None:
@@ -116,6 +377,43 @@ class StatsView(AbstractGrid):
         """
         super().__init__(master, (2, 4), (width, STATS_HEIGHT), **kwargs)
         self.config(background=THEME_COLOUR)
+        self._texts = {}  # Maps cell positions to (canvas id, text)
+
+    def annotate_position(self, position: tuple[int, int], text: str) -> None:
+        """
+        Annotates the cell at the given position with the text, changing the
+        text item already there rather than creating a new one.
+
+        Parameters:
+            position: The (row, col) cell position.
+            text: The text to draw.
+        """
+        drawn = self._texts.get(position)
+        if drawn is None:
+            canvas_id = self.create_text(self.get_midpoint(position),
+                                         text=text, font=TEXT_FONT)
+            self._texts[position] = (canvas_id, text)
+        elif drawn[1] != text:
+            self.itemconfigure(drawn[0], text=text)
+            self._texts[position] = (drawn[0], text)
+
+    def clear(self) -> None:
+        """Clears the canvas and forgets the text items drawn on it."""
+        super().clear()
+        self._texts = {}
+
+    def handle_events(self, events: list[tuple[str, Any]]) -> None:
+        """
+        Updates the player's stats or coins if they changed.
+
+        Parameters:
+            events: The change events from the model.
+        """
+        for kind, data in events:
+            if kind == STATS_CHANGED:
+                self.draw_stats(data)
+            elif kind == INVENTORY_CHANGED and data[0] == Coin.__name__:
+                self.draw_coins(data[3])
 
     def draw_stats(self, player_stats: tuple[int, int, int]) -> None:
         """
@@ -144,7 +442,12 @@ class StatsView(AbstractGrid):
 
 
 class InventoryView(tk.Frame):
-    """The view of inventory."""
+    """The view of inventory.
+
+    A label is kept for each kind of item held and only its text is changed
+    when the count changes; labels are only created or destroyed when a kind
+    of item enters or leaves the inventory.
+    """
 
     def __init__(self, master: Union[tk.Tk, tk.Frame], **kwargs) -> None:
         """
@@ -155,6 +458,22 @@ class InventoryView(tk.Frame):
         """
         super().__init__(master, **kwargs)
         self._callback = None
+        self._heading = None
+        self._labels = {}  # Maps item names to (label, count)
+
+    def handle_events(self, events: list[tuple[str, Any]]) -> None:
+        """
+        Updates the labels of any non-coin items whose count changed.
+
+        Parameters:
+            events: The change events from the model.
+        """
+        if self._heading is None:
+            return
+        for kind, data in events:
+            if kind == INVENTORY_CHANGED and data[0] != Coin.__name__:
+                name, item_id, _, count = data
+                self._set_count(name, count, ENTITY_COLOURS[item_id])
 
     def set_click_callback(self, callback: Callable[[str], None]) -> None:
         """Sets the function to be called when an item is clicked. """
@@ -164,8 +483,10 @@ class InventoryView(tk.Frame):
         """Clears all child widgets from this InventoryView"""
         for child in self.winfo_children():
             child.destroy()
+        self._heading = None
+        self._labels = {}
 
-    def _draw_item(self, name: str, num: int, colour: str) -> None:
+    def _draw_item(self, name: str, num: int, colour: str) -> tk.Label:
         """
         Creates and binds a single tk.Label in the InventoryView frame.
 
@@ -179,85 +500,361 @@ class InventoryView(tk.Frame):
         item.pack(fill="both", ipady=10)
         if self._callback:
             item.bind('<Button-1>', lambda event: self._callback(name))
+        return item
+
+    def _set_count(self, name: str, num: int, colour: str) -> None:
+        """
+        Shows the new quantity of an item, creating its label if the item has
+        just entered the inventory and destroying it if the item has left.
+
+        Parameters:
+            name: the name of the item.
+            num: the quantity currently in the users inventory.
+            colour: the background colour for this item label.
+        """
+        label, old_num = self._labels.get(name, (None, 0))
+        if num == old_num:
+            return
+        if num == 0:
+            label.destroy()
+            del self._labels[name]
+        elif label is None:
+            self._labels[name] = (self._draw_item(name, num, colour), num)
+        else:
+            label.config(text=name + ': ' + str(num))
+            self._labels[name] = (label, num)
 
     def draw_inventory(self, inventory: Inventory) -> None:
         """
         Draws any non-coin inventory items with their quantities
-        and binds the callback for each.
+        and binds the callback for each, reusing the labels already drawn.
 
         Parameters:
             inventory: non-coin inventory items.
         """
-        tk.Label(self, text='Inventory', font=HEADING_FONT).pack(fill="both")
+        if self._heading is None:
+            self._heading = tk.Label(self, text='Inventory',
+                                     font=HEADING_FONT)
+            self._heading.pack(fill="both")
+
+        held = {name: items for name, items in inventory.get_items().items()
+                if name != Coin.__name__ and items}
+        for name in list(self._labels):
+            if name not in held:
+                self._set_count(name, 0, '')
+
+        # Labels are packed in the order they were created
+        if list(self._labels) != [name for name in held
+                                  if name in self._labels]:
+            for label, _ in self._labels.values():
+                label.destroy()
+            self._labels = {}
+
+        for name, items in held.items():
+            self._set_count(name, len(items),
+                            ENTITY_COLOURS[items[0].get_id()])
+
+
+class MiniMapView(tk.Canvas):
+    """An overview of the whole maze, drawn into a single image.
+
+    Each cell is one pixel, or a square of pixels for small mazes. Mazes
+    larger than the view are downsampled so each pixel covers a square block
+    of cells. After the first frame only the blocks whose player, item or door
+    state changed are redrawn.
+    """
+
+    def __init__(self, master: Union[tk.Tk, tk.Frame], size: int,
+                 **kwargs) -> None:
+        """
+        Sets up an empty minimap.
 
-        for name, items in inventory.get_items().items():
-            if name != Coin.__name__:
-                self._draw_item(name, len(items),
-                                ENTITY_COLOURS[items[0].get_id()])
+        Parameters:
+            master: The master frame for this Canvas.
+            size: The width and height of the minimap in pixels.
+        """
+        super().__init__(master, width=size, height=size,
+                         highlightthickness=0, **kwargs)
+        self._size = size
+        self._maze = None
+        self._image = None
+        self._items = {}
+        # The item positions when last drawn; _items is the level's live dict
+        self._item_positions = set()
+        self._player_pos = None
+        self._doors = {}  # Maps door positions to their last drawn tile id
+
+    def _set_scale(self, dimensions: tuple[int, int]) -> None:
+        """
+        Chooses how many cells each block covers and how many pixels wide it
+        is drawn so the whole maze fits in the minimap.
 
+        Parameters:
+            dimensions: (#rows, #columns) of the maze.
+        """
+        longest = max(dimensions)
+        self._cells_per_block = max(1, -(-longest // self._size))
+        self._block_pixels = max(1, self._size // longest)
 
-class ImageLevelView(LevelView):
-    """The view of level use image."""
+    def _block_of(self, position: tuple[int, int]) -> tuple[int, int]:
+        """Returns the (row, column) of the block containing the position."""
+        return (position[0] // self._cells_per_block,
+                position[1] // self._cells_per_block)
 
-    def __init__(self, master, dimensions, size, **kwargs):
+    def _block_colour(self, block: tuple[int, int]) -> str:
         """
-        Set up the level.
+        Returns the colour of a block: the player's colour if they are in it,
+        otherwise the colour of an item in it, otherwise the colour of its top
+        left tile.
 
         Parameters:
-            master: The master frame.
-            dimensions: (#rows, #columns)
-            size: (width in pixels, height in pixels)
+            block: The (row, column) of the block.
         """
-        super().__init__(master, dimensions, size, **kwargs)
-        self._photos = {}
-        self._size = size
+        step = self._cells_per_block
+        top, left = block[0] * step, block[1] * step
+        rows, cols = self._maze.get_dimensions()
+        cells = [(row, column)
+                 for row in range(top, min(top + step, rows))
+                 for column in range(left, min(left + step, cols))]
+        if self._player_pos in cells:
+            return ENTITY_COLOURS[PLAYER]
+        for position in cells:
+            item = self._items.get(position)
+            if item is not None:
+                return ENTITY_COLOURS[item.get_id()]
+        return TILE_COLOURS[self._maze.get_tile((top, left)).get_id()]
+
+    def _draw_block(self, block: tuple[int, int]) -> None:
+        """Redraws a single block of the minimap."""
+        pixels = self._block_pixels
+        x_min, y_min = block[1] * pixels, block[0] * pixels
+        self._image.put(self._block_colour(block),
+                        to=(x_min, y_min, x_min + pixels, y_min + pixels))
+
+    def _draw_maze(self) -> None:
+        """Draws the whole maze, writing a band of pixel rows at a time."""
+        step, pixels = self._cells_per_block, self._block_pixels
+        tile_rows = str(self._maze).split('\n')[::step]
+        colours = [[TILE_COLOURS[tile_id] for tile_id in tile_row[::step]]
+                   for tile_row in tile_rows]
+        occupied = {self._block_of(position) for position in self._items}
+        if self._player_pos is not None:
+            occupied.add(self._block_of(self._player_pos))
+        for row, column in occupied:
+            if 0 <= row < len(colours) and 0 <= column < len(colours[row]):
+                colours[row][column] = self._block_colour((row, column))
+
+        width = len(colours[0]) * pixels if colours else 1
+        self.delete('all')
+        self._image = tk.PhotoImage(width=width,
+                                    height=len(colours) * pixels or 1)
+        for row, row_colours in enumerate(colours):
+            line = '{' + ' '.join([colour for colour in row_colours
+                                   for _ in range(pixels)]) + '} '
+            self._image.put(line * pixels, to=(0, row * pixels))
+        self.create_image(0, 0, image=self._image, anchor=tk.NW)
 
-    def _draw_level(self, tiles: list[list[Tile]]) -> None:
+    def draw(self, maze: Maze, items: dict[tuple[int, int], Item],
+             player_pos: tuple[int, int]) -> None:
         """
-        Draw the tiles in the level.
+        Draws the minimap. The whole maze is only drawn when the maze changes;
+        otherwise only the blocks that changed since the last frame are.
 
         Parameters:
-            tiles: The tiles in this level.
+            maze: The current maze for the level.
+            items: Maps locations to the items currently at those locations.
+            player_pos: The current position of the player.
         """
-        num_rows, num_cols = self._dimensions
+        if maze is not self._maze:
+            self._maze, self._items = maze, items
+            self._item_positions = set(items)
+            self._player_pos = player_pos
+            self._doors = {position: maze.get_tile(position).get_id()
+                           for position in maze.get_door_positions()}
+            self._set_scale(maze.get_dimensions())
+            self._draw_maze()
+            return
+
+        changed = self._item_positions ^ items.keys()
+        changed.update(self._doors)
+        self.update_cells(items, player_pos, changed)
+
+    def update_cells(self, items: dict[tuple[int, int], Item],
+                     player_pos: tuple[int, int],
+                     positions: Iterable[tuple[int, int]]) -> None:
+        """
+        Redraws the blocks containing the player's old and new positions and
+        any of the given positions whose item or door state has changed.
 
-        for row in range(num_rows):
-            for column in range(num_cols):
-                tile = tiles[row][column].get_id()
-                image = Image.open('images/' + TILE_IMAGES[tile])
-                image = image.resize(self.get_cell_size())
-                photo = ImageTk.PhotoImage(image)
-                self._photos[(row, column)] = photo
-                self.create_image(self.get_midpoint((row, column)),
-                                  image=photo)
+        Parameters:
+            items: Maps locations to the items currently at those locations.
+            player_pos: The current position of the player.
+            positions: The positions whose item or door may have changed.
+        """
+        if self._maze is None:
+            return
+        changed = set()
+        for position in positions:
+            if position in self._doors:
+                tile_id = self._maze.get_tile(position).get_id()
+                if tile_id == self._doors[position]:
+                    continue
+                self._doors[position] = tile_id
+            changed.add(position)
+        if player_pos != self._player_pos:
+            changed.update((self._player_pos, player_pos))
+
+        self._items, self._player_pos = items, player_pos
+        self._item_positions = set(items)
+        rows, cols = self._maze.get_dimensions()
+        for block in {self._block_of(position) for position in changed
+                      if 0 <= position[0] < rows and 0 <= position[1] < cols}:
+            self._draw_block(block)
+
+
+class SpriteCache:
+    """A cache of sprite images shared by every view in the process.
+
+    Each image file is decoded once, resized once per size, and the same
+    PhotoImage is handed out for each (image, size). The resized sprites are
+    evicted least recently used first. Views must keep their own reference to
+    any PhotoImage they display, since eviction drops the cache's reference.
+    """
+
+    def __init__(self, max_sprites: int = 64) -> None:
+        """
+        Sets up an empty cache.
 
-    def _draw_items(self, items: dict[tuple[int, int], Item]) -> None:
+        Parameters:
+            max_sprites: The most resized sprites to keep.
+        """
+        self._max_sprites = max_sprites
+        self._images = {}  # Maps file names to decoded images
+        self._sprites = OrderedDict()  # Maps (file name, size) to [image, photo]
+        self.hits = 0
+        self.misses = 0
+
+    def _get_sprite(self, filename: str, size: tuple[int, int]) -> list:
         """
-        Draw the items in the level.
+        Returns the cache entry for an image resized to the given size.
 
         Parameters:
-            items: Maps locations to the items currently at those locations.
+            filename: The name of the image file in the images directory.
+            size: The (width, height) in pixels to resize the image to.
+        """
+        key = (filename, tuple(size))
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        image = self._images.get(filename)
+        if image is None:
+            image = Image.open('images/' + filename)
+            image.load()
+            self._images[filename] = image
+        sprite = self._sprites[key] = [image.resize(key[1]), None]
+        while len(self._sprites) > self._max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def get_image(self, filename: str, size: tuple[int, int]) -> Image.Image:
         """
-        for position, item in items.items():
-            item = item.get_id()
-            image = Image.open('images/' + ENTITY_IMAGES[item])
-            image = image.resize(self.get_cell_size())
-            photo = ImageTk.PhotoImage(image)
-            self._photos[position + (item,)] = photo
-            self.create_image(self.get_midpoint(position), image=photo)
+        Returns the image resized to the given size.
 
-    def _draw_player(self, player_pos: tuple[int, int]) -> None:
+        Parameters:
+            filename: The name of the image file in the images directory.
+            size: The (width, height) in pixels to resize the image to.
         """
-        Draw the player in the level.
+        return self._get_sprite(filename, size)[0]
+
+    def get_photo(self, filename: str,
+                  size: tuple[int, int]) -> ImageTk.PhotoImage:
+        """
+        Returns a PhotoImage of the image resized to the given size.
 
         Parameters:
-            player_pos: The current position of the player
+            filename: The name of the image file in the images directory.
+            size: The (width, height) in pixels to resize the image to.
+        """
+        sprite = self._get_sprite(filename, size)
+        if sprite[1] is None:
+            sprite[1] = ImageTk.PhotoImage(sprite[0])
+        return sprite[1]
+
+    def clear(self) -> None:
+        """Removes every cached image."""
+        self._images.clear()
+        self._sprites.clear()
+
+
+SPRITES = SpriteCache()
+
+
+class ImageLevelView(LevelView):
+    """The view of level use image."""
+
+    def __init__(self, master, dimensions, size, **kwargs):
+        """
+        Set up the level.
+
+        Parameters:
+            master: The master frame.
+            dimensions: (#rows, #columns)
+            size: (width in pixels, height in pixels)
         """
-        image = Image.open('images/' + ENTITY_IMAGES[PLAYER])
-        image = image.resize(self.get_cell_size())
-        photo = ImageTk.PhotoImage(image)
-        self._photos[player_pos + (PLAYER,)] = photo
-        self.create_image(self.get_midpoint(player_pos), image=photo)
+        super().__init__(master, dimensions, size, **kwargs)
+        self._photos = {}
+        self._size = size
+
+    def _get_photo(self, key: tuple, filename: str) -> ImageTk.PhotoImage:
+        """
+        Gets an image scaled to the cell size from the sprite cache, keeping a
+        reference to it for as long as it is shown.
+
+        Parameters:
+            key: Identifies where the image is shown.
+            filename: The name of the image file in the images directory.
+        """
+        photo = SPRITES.get_photo(filename, self.get_cell_size())
+        self._photos[key] = photo
+        return photo
+
+    def _create_tile(self, position: tuple[int, int], tile_id: str) -> int:
+        """Creates the image for one tile."""
+        photo = self._get_photo(position, TILE_IMAGES[tile_id])
+        return self.create_image(self.get_midpoint(position), image=photo)
+
+    def _bake_static_layer(self, tile_rows: list[str]) -> ImageTk.PhotoImage:
+        """Composes the static tiles' sprites into one image."""
+        cell_width, cell_height = cell_size = self.get_cell_size()
+        num_cols = len(tile_rows[0]) if tile_rows else 0
+        layer = Image.new('RGBA', (num_cols * cell_width,
+                                   len(tile_rows) * cell_height))
+        sprites = {tile_id: SPRITES.get_image(filename, cell_size)
+                   for tile_id, filename in TILE_IMAGES.items()}
+        for row, tile_ids in enumerate(tile_rows):
+            for column, tile_id in enumerate(tile_ids):
+                layer.paste(sprites[tile_id],
+                            (column * cell_width, row * cell_height))
+        photo = ImageTk.PhotoImage(layer)
+        self._photos['static'] = photo
+        return photo
+
+    def _configure_tile(self, canvas_id: int, position: tuple[int, int],
+                        tile_id: str) -> None:
+        """Changes the image shown for one tile."""
+        photo = self._get_photo(position, TILE_IMAGES[tile_id])
+        self.itemconfig(canvas_id, image=photo)
+
+    def _create_entity(self, position: tuple[int, int],
+                       entity_id: str) -> list[int]:
+        """Creates the image for one item or the player."""
+        photo = self._get_photo(position + (entity_id,),
+                                ENTITY_IMAGES[entity_id])
+        return [self.create_image(self.get_midpoint(position), image=photo)]
 
     def clear(self):
         """clear the level."""
@@ -319,9 +916,7 @@ class ShopView(tk.Frame):
             item: the item which need to be drawn.
         """
         photo_cell = (120, 120)
-        image = Image.open('images/' + ENTITY_IMAGES[item])
-        image = image.resize(photo_cell)
-        photo = ImageTk.PhotoImage(image)
+        photo = SPRITES.get_photo(ENTITY_IMAGES[item], photo_cell)
         self._images[item] = photo
 
         value = self._value[item]
@@ -401,23 +996,122 @@ class ControlsFrame(tk.Frame):
         self.time_label.pack()
 
 
+class RenderScheduler:
+    """Coalesces model change events into at most one redraw per frame.
+
+    Events are queued as they arrive and drawn together when Tk is next idle,
+    but never sooner than one frame after the last redraw, so a held key
+    cannot queue more redraws than the display can show. The time from the
+    first input of a frame to its redraw being painted is recorded.
+    """
+
+    def __init__(self, master: tk.Misc,
+                 render: Callable[[list[tuple[str, Any]]], None],
+                 fps: int = FRAME_RATE) -> None:
+        """
+        Sets up a scheduler with nothing to draw.
+
+        Parameters:
+            master: The widget whose event loop runs the redraws.
+            render: Called with the merged events to draw them.
+            fps: The most redraws per second.
+        """
+        self._master = master
+        self._render = render
+        self._frame_time = 1 / fps
+        self._pending = []
+        self._job = None
+        self._last_paint = 0.0
+        self._input_time = None
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def mark_input(self) -> None:
+        """Records that an input has arrived which has not yet been painted."""
+        if self._input_time is None:
+            self._input_time = time.perf_counter()
+
+    def handle_events(self, events: list[tuple[str, Any]]) -> None:
+        """
+        Queues the events to be drawn at the next frame.
+
+        Parameters:
+            events: The change events from the model.
+        """
+        self._pending.extend(events)
+        if self._job is None:
+            wait = self._last_paint + self._frame_time - time.perf_counter()
+            if wait <= 0:
+                self._job = self._master.after_idle(self.flush)
+            else:
+                self._job = self._master.after(int(wait * 1000) + 1,
+                                               self._flush_when_idle)
+
+    def _flush_when_idle(self) -> None:
+        """Waits for the event loop to be idle before drawing."""
+        self._job = self._master.after_idle(self.flush)
+
+    def flush(self) -> None:
+        """Draws any queued events now and records the latency."""
+        self.cancel()
+        events, self._pending = merge_events(self._pending), []
+        if events:
+            self._render(events)
+            self._master.update_idletasks()
+
+        self._last_paint = time.perf_counter()
+        if self._input_time is not None:
+            latency = self._last_paint - self._input_time
+            self._latencies.append(latency)
+            if PROFILER.enabled:
+                PROFILER.record('input_to_paint', latency)
+            self._input_time = None
+
+    def cancel(self) -> None:
+        """Stops any scheduled redraw, keeping the queued events."""
+        if self._job is not None:
+            self._master.after_cancel(self._job)
+            self._job = None
+
+    def discard(self) -> None:
+        """Forgets the queued events, e.g. when the model is replaced."""
+        self.cancel()
+        self._pending = []
+        self._input_time = None
+
+    def get_latency(self) -> tuple[float, float, float]:
+        """
+        Returns the (last, mean, max) input-to-paint latency in milliseconds
+        over the recent frames, or zeros if nothing has been painted yet.
+        """
+        if not self._latencies:
+            return 0.0, 0.0, 0.0
+        return (self._latencies[-1] * 1000,
+                sum(self._latencies) / len(self._latencies) * 1000,
+                max(self._latencies) * 1000)
+
+
 class GraphicalInterface(UserInterface):
     """A MazeRunner interface that uses ascii to present information."""
 
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Tk, fps: int = FRAME_RATE) -> None:
         """
         Creates a new GraphicalInterface with master frame master.
 
         Parameters:
             master: The master frame for root.
+            fps: The most times per second the views are redrawn.
         """
         self.frame = None
         self.control_view = None
         self.status_view = None
         self.inventory_view = None
+        self.minimap_view = None
         self.menubar = None
         self.level_view = None
         self.master = master
+        self._model = None
+        self.scheduler = RenderScheduler(master, self._render_events, fps)
+        self._overlay = None
 
         self.master.title('MazeRunner')
         tk.Label(self.master, text="MazeRunner",
@@ -440,6 +1134,9 @@ class GraphicalInterface(UserInterface):
         self.inventory_view = InventoryView(self.frame)
         self.inventory_view.pack(fill="both", expand=True)
 
+        self.minimap_view = MiniMapView(self.frame, MINIMAP_SIZE)
+        self.minimap_view.pack(side=tk.BOTTOM)
+
         self.status_view = StatsView(self.master, MAZE_WIDTH + INVENTORY_WIDTH)
         self.status_view.pack()
 
@@ -468,6 +1165,9 @@ class GraphicalInterface(UserInterface):
         self.inventory_view = InventoryView(self.frame)
         self.inventory_view.pack(fill="both", expand=True)
 
+        self.minimap_view = MiniMapView(self.frame, MINIMAP_SIZE)
+        self.minimap_view.pack(side=tk.BOTTOM)
+
         self.status_view = StatsView(self.master, MAZE_WIDTH + INVENTORY_WIDTH)
         self.status_view.pack()
 
@@ -475,6 +1175,18 @@ class GraphicalInterface(UserInterface):
                                           restart_game, shop)
         self.control_view.pack(expand=True)
 
+    def show_profile(self) -> None:
+        """Shows the profiled phase timings over the level, refreshed
+        periodically. Does nothing unless profiling is on."""
+        if not PROFILER.enabled:
+            return
+        if self._overlay is None:
+            self._overlay = tk.Label(self.master, font=('Courier', 9),
+                                     justify=tk.LEFT, background='white')
+            self._overlay.place(in_=self.level_view, x=0, y=0)
+        self._overlay.config(text=PROFILER.summary())
+        self.master.after(PROFILE_REFRESH_MS, self.show_profile)
+
     def clear_all(self) -> None:
         """Clears each of the three major components."""
         self.level_view.clear()
@@ -485,6 +1197,63 @@ class GraphicalInterface(UserInterface):
         """Updates the dimensions of the maze in the level to dimensions."""
         self.level_view.set_dimensions(dimensions)
 
+    def attach(self, model: Model) -> None:
+        """
+        Subscribes the views to the change events of the given model, in place
+        of any model attached before. The views only draw what changed, so the
+        interface should be drawn in full once after attaching.
+
+        Parameters:
+            model: The model to follow.
+        """
+        if self._model is not None:
+            self._model.unsubscribe(self.scheduler.handle_events)
+        self.scheduler.discard()
+        self._model = model
+        model.subscribe(self.scheduler.handle_events)
+
+    def _render_events(self, events: list[tuple[str, Any]]) -> None:
+        """
+        Draws a frame's worth of merged change events in every view.
+
+        Parameters:
+            events: The change events from the model.
+        """
+        self._handle_events(events)
+        self.status_view.handle_events(events)
+        self.inventory_view.handle_events(events)
+
+    def _handle_events(self, events: list[tuple[str, Any]]) -> None:
+        """
+        Updates the level view and minimap for the changes in the model.
+
+        Parameters:
+            events: The change events from the model.
+        """
+        model = self._model
+        if any(kind == LEVEL_CHANGED for kind, _ in events):
+            if not model.has_won():
+                level = model.get_level()
+                self.set_maze_dimensions(level.get_dimensions())
+                self._draw_level(level.get_maze(), level.get_items(),
+                                 model.get_player().get_position())
+            return
+
+        items = model.get_level().get_items()
+        changed = []
+        for kind, data in events:
+            if kind == ITEM_REMOVED:
+                self.level_view.remove_item(data[0])
+                changed.append(data[0])
+            elif kind == DOOR_UNLOCKED:
+                self.level_view.update_doors()
+                changed.extend(data)
+
+        player_pos = model.get_player().get_position()
+        if any(kind == PLAYER_MOVED for kind, _ in events):
+            self.level_view.move_player(player_pos, items)
+        self.minimap_view.update_cells(items, player_pos, changed)
+
     def bind_keypress(self, command: Callable[[tk.Event], None]) -> None:
         """Binds the given command to the general keypress event."""
         self.master.bind('<Key>', command)
@@ -513,8 +1282,7 @@ class GraphicalInterface(UserInterface):
             inventory: The current inventory of the player
             player_stats: The current stats of the player
         """
-        self.clear_all()
-
+        # Every view is retained between frames and updates itself
         self._draw_level(maze, items, player_position)
         self._draw_inventory(inventory)
         self._draw_player_stats(player_stats)
@@ -529,6 +1297,7 @@ class GraphicalInterface(UserInterface):
                     player_position: tuple[int, int]) -> None:
         """Implement the draw level method"""
         self.level_view.draw(maze.get_tiles(), items, player_position)
+        self.minimap_view.draw(maze, items, player_position)
 
     def _draw_player_stats(self, player_stats: tuple[int, int, int]) -> None:
         """Implement the draw player stats method"""
@@ -536,18 +1305,21 @@ class GraphicalInterface(UserInterface):
 
 
 class GraphicalMazeRunner(MazeRunner):
-    def __init__(self, game_file: str, root: tk.Tk) -> None:
+    def __init__(self, game_file: str, root: tk.Tk,
+                 fps: int = FRAME_RATE) -> None:
         """
         Creates a new GraphicalMazeRunner game.
 
         Parameters:
             game_file: The game_file of games.
             root: root of frame.
+            fps: The most times per second the views are redrawn.
         """
         self.root = root
         self.game_file = game_file
-        self._model = Model(game_file)
-        self.gui = GraphicalInterface(self.root)
+        self._level_cache = LevelCache()
+        self._model = Model(game_file, cache=self._level_cache)
+        self.gui = GraphicalInterface(self.root, fps)
 
     def _handle_keypress(self, event: tk.Event) -> None:
         """
@@ -556,20 +1328,25 @@ class GraphicalMazeRunner(MazeRunner):
         Parameters:
             event: event.
         """
-        if not self._model.has_won():
-            if event.char in MOVE_DELTAS:
+        if not self._model.has_won() and event.char in MOVE_DELTAS:
+            # The move is applied now but the views are only redrawn once per
+            # frame, however many keypresses arrive in it
+            self.gui.scheduler.mark_input()
+            position = self._model.get_player().get_position()
+            if isinstance(self._model.get_current_maze().get_tile(position),
+                          Door):
+                # The views read the level when drawing, so draw the moves
+                # queued on this level before the player can leave it
+                self.gui.scheduler.flush()
+            with self._model.batch():
                 self._model.move_player(MOVE_DELTAS.get(event.char))
 
-            if self._model.did_level_up():
-                self.gui.set_maze_dimensions(
-                    self._model.get_level().get_dimensions())
-
+        if self._model.has_won() or self._model.has_lost():
+            self.gui.scheduler.flush()
         if self._model.has_won():
             messagebox.showinfo("WIN", WIN_MESSAGE)
         elif self._model.has_lost():
             messagebox.showinfo("LOSS", LOSS_MESSAGE)
-        else:
-            self._draw()
 
     def _draw(self):
         """draw the gui."""
@@ -591,10 +1368,9 @@ class GraphicalMazeRunner(MazeRunner):
         Parameters:
             item_name: The item name.
         """
-        item = self._model.get_player().get_inventory().remove_item(item_name)
-        if item is not None:
-            item.apply(self._model.get_player())
-            self._draw()
+        self.gui.scheduler.mark_input()
+        with self._model.batch():
+            self._model.use_item(item_name)
 
     def play(self) -> None:
         """ Called to cause gameplay to occur."""
@@ -602,6 +1378,8 @@ class GraphicalMazeRunner(MazeRunner):
         self.gui.create_interface(self._model.
                                   get_current_maze().get_dimensions(), )
         self.gui.set_inventory_callback(self._apply_item)
+        self.gui.attach(self._model)
+        self.gui.show_profile()
 
         self._draw()
 
@@ -617,9 +1395,9 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
         CANDY: Candy,
     }
 
-    def __init__(self, game_file: str, root: tk.Tk):
+    def __init__(self, game_file: str, root: tk.Tk, fps: int = FRAME_RATE):
 
-        super().__init__(game_file, root)
+        super().__init__(game_file, root, fps)
         self.timer = 0
         self.root.after(1000, self._time_count)
 
@@ -638,7 +1416,9 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
 
     def _restart(self):
         """Restart the game."""
-        self._model = Model(self.game_file)
+        self._model.close()
+        self._model = Model(self.game_file, cache=self._level_cache)
+        self.gui.attach(self._model)
         control = self.gui.control_view
         self.timer = 0
         control.time_label.config(text=f'{self.timer // 60}m '
@@ -659,7 +1439,10 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
         """The button event to submit the game file in new_game"""
         try:
             self.game_file = self.input.get()
-            self._model = Model(self.game_file)
+            model = Model(self.game_file, cache=self._level_cache)
+            self._model.close()
+            self._model = model
+            self.gui.attach(self._model)
             self.window.destroy()
 
             self.timer = 0
@@ -688,6 +1471,7 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
             f.write(f'Inventory: {inventory}\n')
             f.write(f'Row: {row}\n')
             f.write(f'Column: {column}\n')
+            f.write(f'State_hash: {self._model.state_hash():016x}\n')
             f.write(f'Time: {self.timer}')
 
         messagebox.showinfo(title="Save information",
@@ -698,16 +1482,19 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
         messagebox.showinfo(title="Load information",
                             message="It's saved in 'save.txt'")
 
+        saved_hash = None
         with open('save.txt', 'r') as file:
             for line in file:
                 line = line.strip()
                 if line.startswith('Game File'):
                     self.game_file = line[11:]
-                    self._model = Model(self.game_file)
+                    self._model.close()
+                    self._model = Model(self.game_file,
+                                        cache=self._level_cache)
                 elif line.startswith('Level_num'):
                     self._model._level_num = int(line[10:])
                 elif line.startswith('Level_items'):
-                    self._model.get_level()._items = eval(line[13:])
+                    self._model.get_level().set_items(eval(line[13:]))
                 elif line.startswith('Player_move'):
                     self._model._num_moves = int(line[13:])
                 elif line.startswith('Hp'):
@@ -722,11 +1509,22 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
                     column = int(line[8:])
                 elif line.startswith('Inventory'):
                     self._model.get_player_inventory()._items = eval(line[11:])
+                elif line.startswith('State_hash'):
+                    saved_hash = int(line[12:], 16)
                 elif line.startswith('Time'):
                     self.timer = int(line[6:])
 
             # Set the status of game.
             self._model.get_player().set_position((row, column))
+            self._model.get_level().attempt_unlock_door()
+            self._model.rehash()
+            if saved_hash is not None \
+                    and saved_hash != self._model.state_hash():
+                messagebox.showwarning(
+                    title="Load information",
+                    message="The saved game does not match its checksum; "
+                            "it may have been changed or damaged.")
+            self.gui.attach(self._model)
             self.gui.set_maze_dimensions(
                 self._model.get_current_maze().get_dimensions())
             self._draw()
@@ -744,18 +1542,19 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
     def _buy_item(self, item, value):
         """Specify buy function, compare the coin and item."""
         position = (0, 0)
-        coin_num = len(self.inventory.get_items().get(Coin.__name__, []))
+        inventory = self._model.get_player_inventory()
+        coin_num = len(inventory.get_items().get(Coin.__name__, []))
 
         if coin_num >= value:
-            for times in range(value):
-                self._model.get_player().get_inventory().remove_item('Coin')
-            item_new = self.ENTITIES.get(item)(position)
-            self._model.get_player().add_item(item_new)
+            self.gui.scheduler.mark_input()
+            with self._model.batch():
+                for times in range(value):
+                    self._model.remove_inventory_item(Coin.__name__)
+                item_new = self.ENTITIES.get(item)(position)
+                self._model.add_inventory_item(item_new)
         else:
             messagebox.showinfo("Error", "You don't have enough coins.")
 
-        self._draw()
-
     def play(self) -> None:
         """ Called to cause gameplay to occur."""
         self.gui.bind_keypress(self._handle_keypress)
@@ -768,6 +1567,8 @@ class AdvancedGraphicalMazeRunner(GraphicalMazeRunner):
                                            self._shop,
                                            self._quit)
         self.gui.set_inventory_callback(self._apply_item)
+        self.gui.attach(self._model)
+        self.gui.show_profile()
 
         self._draw()
 
@@ -784,6 +1585,18 @@ def play_game(root: tk.Tk):
 
 def main():
     """ Entry-point to gameplay """
+    start_profiling([
+        (GraphicalMazeRunner, '_handle_keypress'),
+        (Model, 'move_player'),
+        (Model, 'attempt_collect_item'),
+        (RenderScheduler, 'flush'),
+        (GraphicalInterface, '_handle_events'),
+        (StatsView, 'handle_events'),
+        (InventoryView, 'handle_events'),
+        (GraphicalInterface, '_draw_level'),
+        (GraphicalInterface, '_draw_inventory'),
+        (GraphicalInterface, '_draw_player_stats'),
+    ])
     root = tk.Tk()
     play_game(root)
 
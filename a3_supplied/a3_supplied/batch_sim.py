@@ -0,0 +1,228 @@
+""" Simulates many independent players on one level at once with NumPy.
+
+    Every player starts from the same level state and follows their own moves.
+    Positions, stats, move counts and which items each player has collected
+    are kept as arrays, and all players take one move per step with
+    vectorised operations. Each player follows Model.move_player and
+    Model.attempt_collect_item exactly, including negative positions reached by
+    wrapping round from the top or left edge, and stops once they leave the
+    level, lose, or make a move that would raise an IndexError in the Model.
+"""
+from __future__ import annotations
+from typing import Iterable, Optional
+
+import numpy as np
+
+from a2_solution import Level, COIN, DOOR, WALL, MAX_HEALTH, MAX_HUNGER, \
+    MAX_THIRST, MOVE_DELTAS
+
+# The move keys in the order of their codes in move arrays; -1 means no move
+MOVE_KEYS = tuple(MOVE_DELTAS)
+NO_MOVE = -1
+
+# The status of each player
+PLAYING = 0
+ESCAPED = 1  # Left the level through a door
+LOST = 2
+INVALID = 3  # Moved off the grid where the Model raises an IndexError
+
+
+def encode_moves(moves: Iterable[str]) -> np.ndarray:
+    """ Converts move strings, one per player, to an array of move codes.
+
+    Parameters:
+        moves: A string of move keys for each player, e.g. 'wwdsa'.
+
+    Returns:
+        An int8 array of shape (#players, length of the longest string), padded
+        with NO_MOVE.
+
+    Raises:
+        ValueError: If a string contains something other than move keys.
+    """
+    moves = list(moves)
+    length = max((len(player_moves) for player_moves in moves), default=0)
+    codes = np.full((len(moves), length), NO_MOVE, dtype=np.int8)
+    lookup = np.full(256, NO_MOVE - 1, dtype=np.int8)
+    for code, key in enumerate(MOVE_KEYS):
+        lookup[ord(key)] = code
+    for player, player_moves in enumerate(moves):
+        row = lookup[np.frombuffer(player_moves.encode('latin-1'),
+                                   dtype=np.uint8)]
+        if (row < NO_MOVE).any():
+            raise ValueError(f'Invalid moves for player {player}: '
+                             f'{player_moves!r}')
+        codes[player, :len(row)] = row
+    return codes
+
+
+class BatchSimulator:
+    """ Many independent players moving through copies of one level. """
+
+    def __init__(self, level: Level, num_players: int,
+                 start: Optional[tuple[int, int]] = None,
+                 stats: tuple[int, int, int] = (MAX_HEALTH, 0, 0),
+                 num_moves: int = 0) -> None:
+        """ Puts every player at the start of the level.
+
+        Parameters:
+            level: The level to play; it is not changed.
+            num_players: How many players to simulate.
+            start: The (row, column) to start from; defaults to the level's
+                player start.
+            stats: The (HP, hunger, thirst) to start with.
+            num_moves: The moves already made, which decides when hunger and
+                thirst next go up.
+        """
+        maze = level.get_maze()
+        self._num_rows, self._num_cols = maze.get_dimensions()
+        codes = np.frombuffer(bytes(maze.get_cells()), dtype=np.uint8)
+        _, damage, exits = maze.get_move_tables()
+        self._open_locked = (codes != ord(WALL)) & (codes != ord(DOOR))
+        self._open_unlocked = codes != ord(WALL)
+        self._damage = np.frombuffer(damage, dtype=np.uint8).astype(np.int32)
+        self._exits = np.frombuffer(exits, dtype=np.uint8).astype(bool)
+
+        # Number the items; item_at maps each cell to its item's number or -1
+        self._items = list(level.get_items().items())
+        self._item_at = np.full(codes.size, -1, dtype=np.int32)
+        for number, ((row, col), _) in enumerate(self._items):
+            self._item_at[row * self._num_cols + col] = number
+        self._is_coin = np.array([item.get_id() == COIN
+                                  for _, item in self._items], dtype=bool)
+        self._num_coins = int(self._is_coin.sum())
+        num_words = max(1, -(-len(self._items) // 64))
+
+        row, col = level.get_player_start() if start is None else start
+        self.positions = np.tile(np.array([row, col], dtype=np.int64),
+                                 (num_players, 1))
+        self.health = np.full(num_players, stats[0], dtype=np.int64)
+        self.hunger = np.full(num_players, stats[1], dtype=np.int64)
+        self.thirst = np.full(num_players, stats[2], dtype=np.int64)
+        self.num_moves = np.full(num_players, num_moves, dtype=np.int64)
+        self.collected = np.zeros((num_players, num_words), dtype=np.uint64)
+        self.coins = np.zeros(num_players, dtype=np.int64)
+        self.unlocked = np.full(num_players, maze.doors_unlocked(), dtype=bool)
+        already_lost = stats[0] <= 0 or stats[1] >= MAX_HUNGER \
+            or stats[2] >= MAX_THIRST
+        self.status = np.full(num_players, LOST if already_lost else PLAYING,
+                              dtype=np.int8)
+
+        self._deltas = np.array([MOVE_DELTAS[key] for key in MOVE_KEYS],
+                                dtype=np.int64)
+
+    def get_num_players(self) -> int:
+        """ Returns the number of players being simulated. """
+        return len(self.status)
+
+    def step(self, moves: np.ndarray) -> None:
+        """ Makes one move for every player still playing.
+
+        Parameters:
+            moves: The move code (an index into MOVE_KEYS, or NO_MOVE) for
+                each player.
+        """
+        moves = np.asarray(moves)
+        players = np.nonzero((self.status == PLAYING) & (moves != NO_MOVE))[0]
+        if players.size == 0:
+            return
+        num_rows, num_cols = self._num_rows, self._num_cols
+        row, col = self.positions[players, 0], self.positions[players, 1]
+        delta = self._deltas[moves[players]]
+        new_row, new_col = row + delta[:, 0], col + delta[:, 1]
+
+        # Leaving the grid from a door completes the level. Otherwise negative
+        # positions wrap round, as they do in Maze.get_tile
+        off_grid = (new_row < 0) | (new_row >= num_rows) \
+            | (new_col < 0) | (new_col >= num_cols)
+        here = (row % num_rows) * num_cols + col % num_cols
+        escaped = off_grid & self._exits[here]
+        tile_row = np.where(new_row < 0, new_row + num_rows, new_row)
+        tile_col = np.where(new_col < 0, new_col + num_cols, new_col)
+        invalid = ~escaped & ((tile_row < 0) | (tile_row >= num_rows)
+                              | (tile_col < 0) | (tile_col >= num_cols))
+        self.status[players[escaped]] = ESCAPED
+        self.status[players[invalid]] = INVALID
+
+        target = np.clip(tile_row, 0, num_rows - 1) * num_cols \
+            + np.clip(tile_col, 0, num_cols - 1)
+        unlocked = self.unlocked[players]
+        passable = np.where(unlocked, self._open_unlocked[target],
+                            self._open_locked[target])
+        moved = passable & ~escaped & ~invalid
+        players, target, off_grid = players[moved], target[moved], \
+            off_grid[moved]
+        new_row, new_col = new_row[moved], new_col[moved]
+
+        num_moves = self.num_moves[players] + 1
+        self.num_moves[players] = num_moves
+        tick = num_moves % 5 == 0
+        self.hunger[players] = np.minimum(self.hunger[players] + tick,
+                                          MAX_HUNGER)
+        self.thirst[players] = np.minimum(self.thirst[players] + tick,
+                                          MAX_THIRST)
+        self.health[players] = np.clip(
+            self.health[players] - 1 - self._damage[target], 0, MAX_HEALTH)
+        self.positions[players, 0] = new_row
+        self.positions[players, 1] = new_col
+
+        self._collect(players, np.where(off_grid, -1, self._item_at[target]))
+
+        # The doors unlock after any move once every coin has been collected
+        self.unlocked[players] |= self.coins[players] == self._num_coins
+        lost = (self.health[players] <= 0) \
+            | (self.hunger[players] >= MAX_HUNGER) \
+            | (self.thirst[players] >= MAX_THIRST)
+        self.status[players[lost]] = LOST
+
+    def _collect(self, players: np.ndarray, items: np.ndarray) -> None:
+        """ Collects the items the players moved onto, unless they already have.
+
+        Parameters:
+            players: The players who moved.
+            items: The number of the item each player moved onto, or -1.
+        """
+        has_item = items >= 0
+        players, items = players[has_item], items[has_item]
+        if players.size == 0:
+            return
+        words = items >> 6
+        bits = np.left_shift(np.uint64(1), (items & 63).astype(np.uint64))
+        new = (self.collected[players, words] & bits) == 0
+        players, items = players[new], items[new]
+        self.collected[players, words[new]] |= bits[new]
+        self.coins[players] += self._is_coin[items]
+
+    def run(self, moves: np.ndarray) -> None:
+        """ Makes every move for every player, stopping early once no one is
+            still playing.
+
+        Parameters:
+            moves: An array of shape (#players, #steps) of move codes, e.g.
+                from encode_moves.
+        """
+        for column in range(moves.shape[1]):
+            if not (self.status == PLAYING).any():
+                break
+            self.step(moves[:, column])
+
+    def get_collected(self, player: int) -> list[tuple[tuple[int, int], str]]:
+        """ Returns the (position, item name) of the items a player collected,
+            in the order of the level's items.
+
+        Parameters:
+            player: The index of the player.
+        """
+        words = self.collected[player]
+        return [(position, item.get_name())
+                for number, (position, item) in enumerate(self._items)
+                if int(words[number >> 6]) >> (number & 63) & 1]
+
+    def get_stats(self, player: int) -> tuple[int, int, int]:
+        """ Returns a player's (HP, hunger, thirst). """
+        return (int(self.health[player]), int(self.hunger[player]),
+                int(self.thirst[player]))
+
+    def get_position(self, player: int) -> tuple[int, int]:
+        """ Returns a player's (row, column) position. """
+        return int(self.positions[player, 0]), int(self.positions[player, 1])
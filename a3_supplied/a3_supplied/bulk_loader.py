@@ -0,0 +1,203 @@
+""" Bulk loading of MazeRunner game files, with levels parsed in parallel by a
+    pool of worker processes.
+
+    Run as a script to compare the throughput of the serial load_game against
+    the parallel loader:
+
+        python bulk_loader.py games/*.txt
+"""
+from __future__ import annotations
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Union
+
+from a2_solution import Level, Maze, load_game, parse_level
+from constants import PLAYER
+
+# A compact, picklable form of a parsed level:
+# (dimensions, tile codes, ((position, entity id), ...))
+LevelPayload = tuple[tuple[int, int], bytes, tuple[tuple[tuple[int, int], str], ...]]
+
+
+def split_levels(filename: str) -> list[str]:
+    """ Splits a game file into the text of each of its levels.
+
+    Parameters:
+        filename: The path to the game file
+
+    Returns:
+        The text of each level, from its 'Maze' header up to the next one.
+    """
+    chunks = []
+    with open(filename, 'r') as file:
+        for line in file:
+            if line.strip().startswith('Maze'):
+                chunks.append([])
+            if chunks:
+                chunks[-1].append(line)
+    return [''.join(chunk) for chunk in chunks]
+
+
+def level_to_payload(level: Level) -> LevelPayload:
+    """ Returns the compact payload form of a level.
+
+    Parameters:
+        level: The level to convert.
+    """
+    maze = level.get_maze()
+    entities = [(position, item.get_id())
+                for position, item in level.get_items().items()]
+    if level.get_player_start() is not None:
+        entities.append((level.get_player_start(), PLAYER))
+    return (tuple(maze.get_dimensions()), bytes(maze.get_cells()),
+            tuple(entities))
+
+
+def level_from_payload(payload: LevelPayload) -> Level:
+    """ Builds a level from its compact payload form.
+
+    Parameters:
+        payload: The payload returned by level_to_payload.
+    """
+    dimensions, cells, entities = payload
+    level = Level(dimensions, Maze.from_cells(dimensions, bytearray(cells)))
+    for position, entity_id in entities:
+        level.add_entity(position, entity_id)
+    return level
+
+
+def _parse_chunk(task: tuple[str, bool]) -> Union[Level, LevelPayload]:
+    """ Worker function which parses the text of one level.
+
+    Parameters:
+        task: (level text, whether to return a payload instead of a Level)
+    """
+    text, as_payload = task
+    level = parse_level(text.splitlines())
+    return level_to_payload(level) if as_payload else level
+
+
+class LoadReport:
+    """ Throughput figures for loading a set of game files. """
+
+    def __init__(self, label: str, levels: int, cells: int,
+                 seconds: float) -> None:
+        """ Records the result of one load.
+
+        Parameters:
+            label: A short description of how the files were loaded.
+            levels: The number of levels loaded.
+            cells: The total number of maze cells loaded.
+            seconds: The wall-clock time taken.
+        """
+        self.label = label
+        self.levels = levels
+        self.cells = cells
+        self.seconds = seconds
+
+    def levels_per_second(self) -> float:
+        """ Returns the number of levels loaded per second. """
+        return self.levels / self.seconds if self.seconds else float('inf')
+
+    def cells_per_second(self) -> float:
+        """ Returns the number of maze cells loaded per second. """
+        return self.cells / self.seconds if self.seconds else float('inf')
+
+    def __str__(self) -> str:
+        return (f"{self.label}: {self.levels} levels, {self.cells} cells in "
+                f"{self.seconds:.3f}s ({self.levels_per_second():.1f} "
+                f"levels/s, {self.cells_per_second():.0f} cells/s)")
+
+    def __repr__(self) -> str:
+        return (f"LoadReport({self.label!r}, {self.levels}, {self.cells}, "
+                f"{self.seconds})")
+
+
+def load_games(
+    filenames: Iterable[str],
+    processes: Optional[int] = None,
+    payloads: bool = False,
+    chunksize: int = 4
+) -> list[list[Union[Level, LevelPayload]]]:
+    """ Loads many game files, parsing all of their levels in a process pool.
+
+    Parameters:
+        filenames: The paths to the game files.
+        processes: The number of worker processes (defaults to the CPU count).
+        payloads: If True, return compact level payloads instead of Levels.
+        chunksize: The number of levels sent to a worker at a time.
+
+    Returns:
+        For each file in the order given, its levels in file order.
+    """
+    chunks = [split_levels(filename) for filename in filenames]
+    tasks = [(text, payloads) for file_chunks in chunks for text in file_chunks]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        parsed = iter(pool.map(_parse_chunk, tasks, chunksize=chunksize))
+        return [[next(parsed) for _ in file_chunks] for file_chunks in chunks]
+
+
+def load_game_parallel(filename: str, processes: Optional[int] = None,
+                       payloads: bool = False) -> list[Union[Level, LevelPayload]]:
+    """ Loads a single game file, parsing its levels in a process pool.
+
+    Parameters:
+        filename: The path to the game file
+        processes: The number of worker processes (defaults to the CPU count).
+        payloads: If True, return compact level payloads instead of Levels.
+    """
+    return load_games([filename], processes, payloads)[0]
+
+
+def benchmark(filenames: list[str], processes: Optional[int] = None,
+              payloads: bool = False) -> tuple[LoadReport, LoadReport]:
+    """ Loads the given files serially with load_game and then in parallel,
+        and reports the throughput of each.
+
+    Parameters:
+        filenames: The paths to the game files.
+        processes: The number of worker processes (defaults to the CPU count).
+        payloads: If True, the parallel loader returns payloads.
+
+    Returns:
+        (serial report, parallel report)
+    """
+    start = time.perf_counter()
+    serial = [load_game(filename) for filename in filenames]
+    serial_time = time.perf_counter() - start
+
+    levels = [level for game in serial for level in game]
+    num_cells = sum(rows * cols for rows, cols in
+                    (level.get_dimensions() for level in levels))
+
+    start = time.perf_counter()
+    load_games(filenames, processes, payloads)
+    parallel_time = time.perf_counter() - start
+
+    workers = processes or os.cpu_count()
+    return (LoadReport('serial load_game', len(levels), num_cells, serial_time),
+            LoadReport(f'parallel ({workers} processes)', len(levels),
+                       num_cells, parallel_time))
+
+
+def main():
+    """ Entry-point for comparing serial and parallel loading. """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('files', nargs='+', help='game files to load')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('--payloads', action='store_true',
+                        help='return compact payloads instead of Levels')
+    args = parser.parse_args()
+
+    serial, parallel = benchmark(args.files, args.processes, args.payloads)
+    print(serial)
+    print(parallel)
+    print(f'speedup: {serial.seconds / parallel.seconds:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -24,6 +24,7 @@ APPLE_AMOUNT = -1
 HONEY_AMOUNT = -5
 WATER_AMOUNT = -5
 POTION_AMOUNT = 20
+CANDY_HEALTH_AMOUNT = -2
 
 UP = 'w'
 DOWN = 's'
@@ -36,11 +37,30 @@ MOVE_DELTAS = {
     RIGHT: (0, 1),
 }
 
+# The bit set in a move table entry when the move in that direction is
+# passable; the bit MOVE_OFF_GRID_SHIFT places higher is set when it leaves
+# the grid.
+MOVE_BITS = {
+    (-1, 0): 1,
+    (1, 0): 2,
+    (0, -1): 4,
+    (0, 1): 8,
+}
+MOVE_OFF_GRID_SHIFT = 4
+
 MAX_HEALTH = 100
 MAX_HUNGER = 10
 MAX_THIRST = 10
 LAVA_DAMAGE = 5
 
+# Kinds of change events emitted by the Model
+PLAYER_MOVED = 'player_moved'
+ITEM_REMOVED = 'item_removed'
+DOOR_UNLOCKED = 'door_unlocked'
+STATS_CHANGED = 'stats_changed'
+INVENTORY_CHANGED = 'inventory_changed'
+LEVEL_CHANGED = 'level_changed'
+
 WIN_MESSAGE = 'Congratulations! You have finished all levels and won the game!'
 LOSS_MESSAGE = 'You lose :('
 ITEM_UNAVAILABLE_MESSAGE = '\nYou don\'t have any of that item!\n'
@@ -75,9 +95,15 @@ TEXT_FONT = ('Courier', 18)
 
 MAZE_WIDTH = 600
 MAZE_HEIGHT = 600
+MIN_CELL_SIZE = 20
 INVENTORY_WIDTH = 200
+MINIMAP_SIZE = 200
 STATS_HEIGHT = 100
 
+FRAME_RATE = 60  # The most times per second the views are redrawn
+LATENCY_SAMPLES = 120  # How many input-to-paint latencies are kept
+PROFILE_REFRESH_MS = 500  # How often the profile overlay is refreshed
+
 TILE_IMAGES = {
     WALL: 'wall.png',
     EMPTY: 'grass.png',
@@ -0,0 +1,204 @@
+""" Cached fields of the HP it costs to reach a cell from every other cell.
+
+    A field is found by running Dijkstra's algorithm back from its target over
+    the maze's move tables, where stepping onto a tile costs 1 HP plus the
+    tile's damage(), so a path across lava costs LAVA_DAMAGE more per lava
+    tile than one around it. Fields are kept per level, as compact arrays with
+    one unsigned 32-bit cost per cell, in an LRU cache of the most recently
+    used targets.
+
+    Unlocking a level's doors can only shorten paths that go through a door,
+    so when a level's doors have been unlocked since a field was found, the
+    field is only found again if its search reached a door.
+"""
+from __future__ import annotations
+import heapq
+from array import array
+from collections import OrderedDict
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+from a2_solution import Level, MOVE_BITS, MOVE_DELTAS
+
+# The cost of cells from which the target cannot be reached
+UNREACHABLE = 0xFFFFFFFF
+
+MOVE_KEYS = tuple(MOVE_DELTAS)
+
+
+class _Field:
+    """ The cost to reach one target from every cell of a level. """
+
+    def __init__(self, costs: array, doors_unlocked: bool,
+                 reaches_door: bool) -> None:
+        """ Records a field.
+
+        Parameters:
+            costs: The HP cost from each cell, in row-major order.
+            doors_unlocked: Whether the doors were unlocked when it was found.
+            reaches_door: Whether its search reached a door, so unlocking the
+                doors could change it.
+        """
+        self.costs = costs
+        self.doors_unlocked = doors_unlocked
+        self.reaches_door = reaches_door
+
+
+def find_field(level: Level, target: tuple[int, int]) -> tuple[array, bool]:
+    """ Finds the HP it costs to walk from every cell of a level to a target,
+        with the doors as they are now.
+
+    Parameters:
+        level: The level to search; it is not changed.
+        target: The (row, column) cell to walk to.
+
+    Returns:
+        The cost from each cell in row-major order (UNREACHABLE if the target
+        cannot be reached from it), and whether the search reached a door.
+    """
+    maze = level.get_maze()
+    num_rows, num_cols = maze.get_dimensions()
+    moves, damage, _ = maze.get_move_tables()
+    # Each step back from a cell, as (the bit of the move into the cell from
+    # its neighbour, the offset of the neighbour)
+    steps = [(MOVE_BITS[(row_delta, col_delta)],
+              -(row_delta * num_cols + col_delta))
+             for row_delta, col_delta in MOVE_DELTAS.values()]
+
+    costs = array('I', [UNREACHABLE]) * (num_rows * num_cols)
+    row, col = target
+    start = row * num_cols + col
+    costs[start] = 0
+    queue = [(0, start)]
+    while queue:
+        cost, cell = heapq.heappop(queue)
+        if cost > costs[cell]:
+            continue
+        # Stepping onto this cell costs 1 HP plus its damage
+        cost += 1 + damage[cell]
+        for bit, offset in steps:
+            neighbour = cell + offset
+            if 0 <= neighbour < len(costs) and moves[neighbour] & bit \
+                    and cost < costs[neighbour]:
+                costs[neighbour] = cost
+                heapq.heappush(queue, (cost, neighbour))
+
+    reaches_door = any(costs[row * num_cols + col] != UNREACHABLE
+                       for row, col in maze.get_door_positions())
+    return costs, reaches_door
+
+
+class DistanceFieldCache:
+    """ An LRU cache of HP cost fields for each level, by target cell. """
+
+    def __init__(self, max_fields: int = 64) -> None:
+        """ Sets up an empty cache.
+
+        Parameters:
+            max_fields: The most fields to keep for each level before evicting
+                the least recently used.
+        """
+        self._max_fields = max_fields
+        # Maps each level to an OrderedDict from target cells to _Field; a
+        # level's fields go when the level does
+        self._levels = WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_field(self, level: Level, target: tuple[int, int]) -> array:
+        """ Returns the HP it costs to walk from every cell of a level to a
+            target, finding it only if it is not already cached.
+
+        Parameters:
+            level: The level to search; it is not changed.
+            target: The (row, column) cell to walk to.
+
+        Returns:
+            The cost from each cell in row-major order, or UNREACHABLE. The
+            array is shared, so it must not be changed.
+        """
+        fields = self._levels.get(level)
+        if fields is None:
+            fields = self._levels[level] = OrderedDict()
+        doors_unlocked = level.get_maze().doors_unlocked()
+
+        field = fields.get(target)
+        if field is not None and field.doors_unlocked != doors_unlocked:
+            if field.reaches_door:
+                del fields[target]
+                self.invalidations += 1
+                field = None
+            else:
+                field.doors_unlocked = doors_unlocked
+        if field is not None:
+            fields.move_to_end(target)
+            self.hits += 1
+            return field.costs
+
+        self.misses += 1
+        costs, reaches_door = find_field(level, target)
+        fields[target] = _Field(costs, doors_unlocked, reaches_door)
+        while len(fields) > self._max_fields:
+            fields.popitem(last=False)
+        return costs
+
+    def get_cost(self, level: Level, source: tuple[int, int],
+                 target: tuple[int, int]) -> Optional[int]:
+        """ Returns the least HP it costs to walk from one cell to another, or
+            None if there is no way there.
+
+        Parameters:
+            level: The level to search; it is not changed.
+            source: The (row, column) cell to walk from.
+            target: The (row, column) cell to walk to.
+        """
+        num_cols = level.get_dimensions()[1]
+        cost = self.get_field(level, target)[source[0] * num_cols + source[1]]
+        return None if cost == UNREACHABLE else cost
+
+    def next_move(self, level: Level, source: tuple[int, int],
+                  target: tuple[int, int]) -> Optional[str]:
+        """ Returns the first move of a cheapest walk from one cell to another,
+            or None if already there or there is no way there.
+
+        Parameters:
+            level: The level to search; it is not changed.
+            source: The (row, column) cell to walk from.
+            target: The (row, column) cell to walk to.
+        """
+        costs = self.get_field(level, target)
+        maze = level.get_maze()
+        num_cols = maze.get_dimensions()[1]
+        moves, damage, _ = maze.get_move_tables()
+        cell = source[0] * num_cols + source[1]
+        if costs[cell] in (0, UNREACHABLE):
+            return None
+        for key in MOVE_KEYS:
+            row_delta, col_delta = MOVE_DELTAS[key]
+            neighbour = cell + row_delta * num_cols + col_delta
+            if moves[cell] & MOVE_BITS[(row_delta, col_delta)] and \
+                    1 + damage[neighbour] + costs[neighbour] == costs[cell]:
+                return key
+        return None
+
+    def invalidate(self, level: Optional[Level] = None) -> None:
+        """ Removes the fields of a level, or of every level.
+
+        Parameters:
+            level: The level to forget, or None to clear the cache.
+        """
+        if level is None:
+            self._levels.clear()
+        else:
+            self._levels.pop(level, None)
+
+    def __len__(self) -> int:
+        return sum(len(fields) for fields in self._levels.values())
+
+    def __repr__(self) -> str:
+        return f"DistanceFieldCache(max_fields={self._max_fields})"
+
+
+# The cache shared by bots, hints and planners in this process
+DISTANCE_FIELDS = DistanceFieldCache()
@@ -0,0 +1,187 @@
+""" A headless MazeRunner engine for bots, tests and batch evaluation.
+
+    Drives a Model directly rather than through input() or Tk keypresses, and
+    imports neither tkinter nor PIL, so it runs without a display.
+
+    Run as a script to measure how many random moves per second it makes:
+
+        python engine.py games/game2.txt
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from typing import Iterable, Optional
+
+from a2_solution import Item, Model, MOVE_DELTAS
+from level_cache import LevelCache
+
+
+class Engine:
+    """ Plays one game of MazeRunner from moves given by the caller. """
+
+    def __init__(self, game_file: str,
+                 cache: Optional[LevelCache] = None) -> None:
+        """ Loads a game, ready to play from the start.
+
+        Parameters:
+            game_file: Path to the file from which the game levels are loaded.
+            cache: The cache to load levels through. Defaults to a cache of
+                this game alone, so resets skip parsing.
+        """
+        self._game_file = game_file
+        self._cache = LevelCache(max_entries=1) if cache is None else cache
+        self.reset()
+
+    def reset(self) -> None:
+        """ Restarts the game from the first level. """
+        self._model = Model(self._game_file, cache=self._cache)
+
+    def get_model(self) -> Model:
+        """ Returns the model of the game being played. """
+        return self._model
+
+    def is_over(self) -> bool:
+        """ Returns True iff the game has been won or lost. """
+        return self._model.has_won() or self._model.has_lost()
+
+    def step(self, move: str) -> bool:
+        """ Attempts to move the player one square.
+
+        Parameters:
+            move: One of the move keys in MOVE_DELTAS.
+
+        Returns:
+            False iff the game was already over, so the move was ignored.
+
+        Raises:
+            ValueError: If the move is not a move key.
+        """
+        delta = MOVE_DELTAS.get(move)
+        if delta is None:
+            raise ValueError(f'Invalid move: {move!r}')
+        if self.is_over():
+            return False
+        self._model.move_player(delta)
+        return True
+
+    def step_many(self, moves: Iterable[str]) -> int:
+        """ Attempts each move in turn, stopping once the game is over.
+
+        Parameters:
+            moves: Move keys, e.g. a string such as 'wwddsa'.
+
+        Returns:
+            The number of moves made before the game ended or the moves ran out.
+
+        Raises:
+            ValueError: If a move is not a move key; no moves are made.
+        """
+        moves = moves if isinstance(moves, str) else ''.join(moves)
+        count = 0
+        # apply_moves stops at each level up, so carry on with the rest
+        while moves and not self.is_over():
+            made = self._model.apply_moves(moves).get_num_moves()
+            count += made
+            moves = moves[made:]
+        return count
+
+    def use_item(self, item_name: str) -> bool:
+        """ Uses one item with the given name from the player's inventory.
+
+        Parameters:
+            item_name: The name of the item, e.g. 'Potion'.
+
+        Returns:
+            True iff the player had such an item and the game was not over.
+        """
+        return not self.is_over() and self._model.use_item(item_name)
+
+    def get_position(self) -> tuple[int, int]:
+        """ Returns the player's (row, column) position. """
+        return self._model.get_player().get_position()
+
+    def get_stats(self) -> tuple[int, int, int]:
+        """ Returns the player's (HP, hunger, thirst). """
+        return self._model.get_player_stats()
+
+    def get_inventory_counts(self) -> dict[str, int]:
+        """ Returns how many of each kind of item the player holds. """
+        return {name: len(items) for name, items in
+                self._model.get_player_inventory().get_items().items()}
+
+    def get_items(self) -> dict[tuple[int, int], Item]:
+        """ Returns the items left in the current level, by position. Empty
+            once the game has been won.
+        """
+        if self._model.has_won():
+            return {}
+        return self._model.get_current_items()
+
+    def get_state(self) -> dict:
+        """ Returns a snapshot of the game state as plain data. """
+        model = self._model
+        return {
+            'level': model.get_level_num(),
+            'position': self.get_position(),
+            'stats': self.get_stats(),
+            'moves': model.get_num_moves(),
+            'inventory': self.get_inventory_counts(),
+            'items_left': len(self.get_items()),
+            'won': model.has_won(),
+            'lost': model.has_lost(),
+        }
+
+
+def benchmark(game_file: str, num_moves: int, chunk_size: int = 1,
+              seed: int = 0) -> float:
+    """ Plays random moves, starting again whenever the game ends, and returns
+        the number of moves made per second.
+
+    Parameters:
+        game_file: Path to the file from which the game levels are loaded.
+        num_moves: How many random moves to play.
+        chunk_size: How many moves to give step_many at once, or 1 to give
+            each to step.
+        seed: The seed for the random moves.
+    """
+    rng = random.Random(seed)
+    moves = ''.join(rng.choice(tuple(MOVE_DELTAS)) for _ in range(num_moves))
+    engine = Engine(game_file)
+    made = 0
+    start = time.perf_counter()
+    if chunk_size == 1:
+        for move in moves:
+            if engine.is_over():
+                engine.reset()
+            engine.step(move)
+        made = num_moves
+    else:
+        while moves:
+            if engine.is_over():
+                engine.reset()
+            count = engine.step_many(moves[:chunk_size])
+            made += count
+            moves = moves[count:]
+    return made / (time.perf_counter() - start)
+
+
+def main():
+    """ Entry-point for measuring the engine's throughput. """
+    parser = argparse.ArgumentParser(
+        description='Measure the random moves per second of the engine.')
+    parser.add_argument('game_file', help='game file to play')
+    parser.add_argument('-n', '--moves', type=int, default=300_000,
+                        help='number of random moves to play')
+    parser.add_argument('-r', '--repeats', type=int, default=3,
+                        help='runs of each kind, of which the best is shown')
+    args = parser.parse_args()
+
+    for name, chunk_size in (('step', 1), ('step_many', 1000)):
+        rate = max(benchmark(args.game_file, args.moves, chunk_size)
+                   for _ in range(args.repeats))
+        print(f'{name:<10}{rate:>12,.0f} moves/s')
+
+
+if __name__ == '__main__':
+    main()
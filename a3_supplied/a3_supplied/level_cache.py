@@ -0,0 +1,178 @@
+""" A cache of parsed game levels, so reloading the same game file skips
+    parsing entirely.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import Optional
+
+from a2_solution import Level, load_game
+
+# Bump when the pickled form of levels changes, to ignore old cache files
+CACHE_VERSION = 2
+
+
+class _CacheEntry:
+    """ The parsed levels of one game file, with what identifies its content. """
+
+    def __init__(self, mtime_ns: int, size: int, digest: str,
+                 levels: list[Level]) -> None:
+        """ Records the parsed levels of a game file.
+
+        Parameters:
+            mtime_ns: The modification time of the file when it was read.
+            size: The size of the file in bytes when it was read.
+            digest: The hash of the file's content.
+            levels: The levels parsed from the file, which are never played
+                directly.
+        """
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.levels = levels
+
+
+class LevelCache:
+    """ An LRU cache of parsed levels keyed by game file path, modification
+        time and content hash, optionally persisted in a directory on disk.
+
+        Cached levels are kept as templates. Each game gets copy-on-write
+        copies of them, which share the template's maze layout.
+
+        An entry is reused while the file's modification time and size are
+        unchanged. Otherwise the file is hashed again: if its content is the
+        same the entry is kept, and if not it is parsed again.
+    """
+
+    def __init__(self, max_entries: int = 8,
+                 cache_dir: Optional[str] = None) -> None:
+        """ Sets up an empty cache.
+
+        Parameters:
+            max_entries: The most game files to keep parsed levels for in
+                memory before evicting the least recently used.
+            cache_dir: A directory in which to also persist parsed levels, or
+                None to only cache in memory.
+        """
+        self._max_entries = max_entries
+        self._cache_dir = cache_dir
+        self._entries = OrderedDict() # Maps absolute paths to _CacheEntry
+        self.hits = 0
+        self.misses = 0
+
+    def get_levels(self, game_file: str) -> list[Level]:
+        """ Returns a fresh copy of the levels in the given game file, parsing
+            the file only if it is not already cached.
+
+        Parameters:
+            game_file: The path to the game file.
+        """
+        return [level.copy() for level in self._get_entry(game_file).levels]
+
+    def _get_entry(self, game_file: str) -> _CacheEntry:
+        """ Returns the up-to-date cache entry for the given game file.
+
+        Parameters:
+            game_file: The path to the game file.
+        """
+        path = os.path.abspath(game_file)
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and (entry.mtime_ns, entry.size) == \
+                (stat.st_mtime_ns, stat.st_size):
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+        with open(path, 'rb') as file:
+            digest = hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+        if entry is not None and entry.digest == digest:
+            self.hits += 1
+        else:
+            levels = self._read_snapshot(digest)
+            if levels is None:
+                self.misses += 1
+                levels = self._parse(path)
+                self._write_snapshot(digest, levels)
+            else:
+                self.hits += 1
+            entry = _CacheEntry(stat.st_mtime_ns, stat.st_size, digest,
+                                levels)
+
+        entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _parse(self, path: str) -> list[Level]:
+        """ Parses every level in the given game file.
+
+        Parameters:
+            path: The path to the game file.
+        """
+        if path.endswith('.mzb'):
+            from mzb import load_compiled
+            return load_compiled(path)
+        return load_game(path)
+
+    def _snapshot_path(self, digest: str) -> Optional[str]:
+        """ Returns the on-disk path for the given content hash, if persisting.
+
+        Parameters:
+            digest: The hash of a game file's content.
+        """
+        if self._cache_dir is None:
+            return None
+        return os.path.join(self._cache_dir,
+                            f'{digest}-v{CACHE_VERSION}.pickle')
+
+    def _read_snapshot(self, digest: str) -> Optional[list[Level]]:
+        """ Returns the persisted levels for the given content hash, if any.
+
+        Parameters:
+            digest: The hash of a game file's content.
+        """
+        path = self._snapshot_path(digest)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+    def _write_snapshot(self, digest: str, levels: list[Level]) -> None:
+        """ Persists parsed levels for the given content hash, if enabled.
+
+        Parameters:
+            digest: The hash of a game file's content.
+            levels: The parsed levels.
+        """
+        path = self._snapshot_path(digest)
+        if path is None:
+            return
+        os.makedirs(self._cache_dir, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump(levels, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def invalidate(self, game_file: Optional[str] = None) -> None:
+        """ Removes the in-memory entry for a game file, or all entries.
+
+        Parameters:
+            game_file: The game file to forget, or None to clear the cache.
+        """
+        if game_file is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(os.path.abspath(game_file), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f"LevelCache(max_entries={self._max_entries}, "
+                f"cache_dir={self._cache_dir!r})")
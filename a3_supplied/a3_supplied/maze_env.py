@@ -0,0 +1,258 @@
+""" Reinforcement-learning style environments over the MazeRunner Model.
+
+    Observations are NumPy arrays. The tiles and items of the current level are
+    views of the maze's tile code buffer and the level's item code buffer, one
+    byte per cell holding the tile or item id (0 for no item), so observing a
+    level copies nothing. The player's position, stats and inventory counts are
+    small fixed-shape arrays which are updated in place on every step; the
+    batched environment keeps them as rows of one array per quantity. Tiles
+    keep their door code once the doors unlock, so whether they are unlocked
+    is observed separately.
+
+    The tiles and items views share the live level buffers, so they are read
+    only; the shapes and types of each observation are in observation_space.
+"""
+from __future__ import annotations
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from a2_solution import Model, COIN, POTION, APPLE, HONEY, WATER, CANDY, \
+    MOVE_DELTAS
+from level_cache import LevelCache
+
+# The actions, in order of their numbers
+MOVE_KEYS = tuple(MOVE_DELTAS)
+MOVES = tuple(MOVE_DELTAS[key] for key in MOVE_KEYS)
+
+# The names of the items counted in the inventory array, in order
+ITEM_NAMES = ('Coin', 'Potion', 'Apple', 'Honey', 'Water', 'Candy')
+ITEM_CODES = tuple(ord(item_id) for item_id in
+                   (COIN, POTION, APPLE, HONEY, WATER, CANDY))
+
+# Rewards for finishing a level (or the game) and for losing
+LEVEL_REWARD = 1.0
+LOSS_REWARD = -1.0
+
+
+class Space(NamedTuple):
+    """ The shape and type of one observation array. A dimension of None
+        varies from level to level.
+    """
+    shape: tuple[Optional[int], ...]
+    dtype: type
+
+
+observation_space = {
+    'tiles': Space((None, None), np.uint8),
+    'items': Space((None, None), np.uint8),
+    'doors_unlocked': Space((1,), np.bool_),
+    'position': Space((2,), np.int64),
+    'stats': Space((3,), np.int64),
+    'inventory': Space((len(ITEM_NAMES),), np.int64),
+}
+action_space = len(MOVE_KEYS)
+
+
+def _read_only(buffer, num_rows: int, num_cols: int) -> np.ndarray:
+    """ Returns a read only (num_rows, num_cols) byte array view of buffer. """
+    view = np.frombuffer(buffer, dtype=np.uint8).reshape(num_rows, num_cols)
+    view.flags.writeable = False
+    return view
+
+
+class MazeEnv:
+    """ One game of MazeRunner, played one action at a time. """
+
+    def __init__(self, game_file: str, cache: Optional[LevelCache] = None,
+                 buffers: Optional[tuple[np.ndarray, ...]] = None) -> None:
+        """ Loads a game, ready to be reset.
+
+        Parameters:
+            game_file: Path to the file from which the game levels are loaded.
+            cache: The cache to load levels through. Defaults to a cache of
+                this game alone, so resets skip parsing.
+            buffers: The (doors_unlocked, position, stats, inventory) arrays,
+                as in observation_space, to write the observations into.
+                Defaults to new arrays.
+        """
+        self._game_file = game_file
+        self._cache = LevelCache(max_entries=1) if cache is None else cache
+        if buffers is None:
+            buffers = tuple(
+                np.zeros(observation_space[name].shape,
+                         dtype=observation_space[name].dtype)
+                for name in ('doors_unlocked', 'position', 'stats',
+                             'inventory'))
+        self._doors, self._position, self._stats, self._inventory = buffers
+        self._model = None
+        self._level_num = None
+        self._rewarded_level = None # The level number when last rewarded
+        self._obs = {'doors_unlocked': self._doors,
+                     'position': self._position, 'stats': self._stats,
+                     'inventory': self._inventory}
+
+    def get_model(self) -> Model:
+        """ Returns the model of the game being played. """
+        return self._model
+
+    def reset(self) -> dict[str, np.ndarray]:
+        """ Restarts the game from the first level.
+
+        Returns:
+            The observation of the first level.
+        """
+        if self._model is not None:
+            self._model.close()
+        self._model = Model(self._game_file, cache=self._cache)
+        self._level_num = None
+        self._observe()
+        self._rewarded_level = self._level_num
+        return self._obs
+
+    def get_observation(self) -> dict[str, np.ndarray]:
+        """ Returns the current observation, which steps update in place. """
+        return self._obs
+
+    def is_over(self) -> bool:
+        """ Returns True iff the game has been won or lost. """
+        return self._model.has_won() or self._model.has_lost()
+
+    def step(self, action: int) -> tuple[dict[str, np.ndarray], float, bool,
+                                         dict]:
+        """ Moves the player one square, unless the game is already over.
+
+        Parameters:
+            action: The number of the move, an index into MOVE_KEYS.
+
+        Returns:
+            The (observation, reward, done, info) after the move. The reward is
+            LEVEL_REWARD for finishing a level, LOSS_REWARD for losing, and 0
+            otherwise; info holds the current level number.
+        """
+        model = self._model
+        if not self.is_over():
+            model.move_player(MOVES[action])
+        self._observe()
+        if model.has_lost():
+            reward, done = LOSS_REWARD, True
+        else:
+            done = model.has_won()
+            reward = LEVEL_REWARD if self._level_num != self._rewarded_level \
+                else 0.0
+        self._rewarded_level = self._level_num
+        return self._obs, reward, done, {'level': self._level_num}
+
+    def use_item(self, item_name: str) -> bool:
+        """ Uses one item with the given name from the player's inventory.
+
+        Parameters:
+            item_name: The name of the item, e.g. 'Potion'.
+
+        Returns:
+            True iff the player had such an item and the game was not over.
+        """
+        used = not self.is_over() and self._model.use_item(item_name)
+        self._observe()
+        return used
+
+    def _observe(self) -> None:
+        """ Brings the observation up to date with the model. """
+        model = self._model
+        level_num = model.get_level_num()
+        if level_num != self._level_num:
+            self._level_num = level_num
+            # Once the game is won there is no level, so keep the last views
+            if not model.has_won():
+                level = model.get_level()
+                num_rows, num_cols = level.get_dimensions()
+                self._obs['tiles'] = _read_only(level.get_maze().get_cells(),
+                                                num_rows, num_cols)
+                self._obs['items'] = _read_only(level.get_item_codes(),
+                                                num_rows, num_cols)
+
+        if not model.has_won():
+            self._doors[0] = model.get_level().get_maze().doors_unlocked()
+        self._position[:] = model.get_player().get_position()
+        self._stats[:] = model.get_player_stats()
+        items = model.get_player_inventory().get_items()
+        inventory = self._inventory
+        for index, name in enumerate(ITEM_NAMES):
+            inventory[index] = len(items.get(name, ()))
+
+
+class VectorMazeEnv:
+    """ Many independent games of MazeRunner, each taking one action per step.
+        A game which ends is reset straight away.
+    """
+
+    def __init__(self, game_file: str, num_envs: int,
+                 cache: Optional[LevelCache] = None) -> None:
+        """ Loads the games, ready to be reset.
+
+        Parameters:
+            game_file: Path to the file from which the game levels are loaded.
+            num_envs: How many games to play at once.
+            cache: The cache to load levels through; shared by every game.
+        """
+        cache = LevelCache(max_entries=1) if cache is None else cache
+        self.doors_unlocked = np.zeros((num_envs, 1), dtype=np.bool_)
+        self.positions = np.zeros((num_envs, 2), dtype=np.int64)
+        self.stats = np.zeros((num_envs, 3), dtype=np.int64)
+        self.inventory = np.zeros((num_envs, len(ITEM_NAMES)), dtype=np.int64)
+        self.envs = [
+            MazeEnv(game_file, cache, (self.doors_unlocked[index],
+                                       self.positions[index],
+                                       self.stats[index],
+                                       self.inventory[index]))
+            for index in range(num_envs)
+        ]
+        self._rewards = np.zeros(num_envs, dtype=np.float64)
+        self._dones = np.zeros(num_envs, dtype=bool)
+
+    def get_num_envs(self) -> int:
+        """ Returns the number of games being played. """
+        return len(self.envs)
+
+    def reset(self) -> dict:
+        """ Restarts every game from the first level.
+
+        Returns:
+            The batched observation.
+        """
+        for env in self.envs:
+            env.reset()
+        return self._observation()
+
+    def step(self, actions) -> tuple[dict, np.ndarray, np.ndarray]:
+        """ Makes one move in every game.
+
+        Parameters:
+            actions: The number of the move for each game.
+
+        Returns:
+            The (observation, rewards, dones) after the moves. A game which is
+            done has already been reset, so its observation is of the new game.
+        """
+        rewards, dones = self._rewards, self._dones
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            _, reward, done, _ = env.step(action)
+            rewards[index] = reward
+            dones[index] = done
+            if done:
+                env.reset()
+        return self._observation(), rewards, dones
+
+    def _observation(self) -> dict:
+        """ Returns the batched observation. The tiles and items are tuples of
+            each game's views, as levels may differ in size.
+        """
+        observations = [env.get_observation() for env in self.envs]
+        return {
+            'tiles': tuple(obs['tiles'] for obs in observations),
+            'items': tuple(obs['items'] for obs in observations),
+            'doors_unlocked': self.doors_unlocked,
+            'position': self.positions,
+            'stats': self.stats,
+            'inventory': self.inventory,
+        }
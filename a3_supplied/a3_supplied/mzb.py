@@ -0,0 +1,246 @@
+""" A compiled binary format (.mzb) for MazeRunner game files, which can be
+    loaded without re-parsing the text of each level.
+
+    Compile text game files with:
+
+        python mzb.py games/*.txt
+
+    Layout (all integers little-endian):
+        header:  magic b'MZB1', u32 #levels, then a u64 byte offset per level
+        level:   u32 #rows, u32 #columns, i32 player start row and column
+                 (-1 if none), u32 #entities, u32 #doors,
+                 #entities x (u32 row, u32 column, u8 entity id),
+                 #doors x (u32 row, u32 column),
+                 #rows * #columns tile codes, one byte per cell
+"""
+from __future__ import annotations
+import argparse
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from typing import Optional
+
+from a2_solution import Level, Maze, load_game
+
+MZB_SUFFIX = '.mzb'
+MAGIC = b'MZB1'
+
+_HEADER = struct.Struct('<4sI')
+_OFFSET = struct.Struct('<Q')
+_LEVEL = struct.Struct('<IIiiII')
+_ENTITY = struct.Struct('<IIB')
+_DOOR = struct.Struct('<II')
+
+# Maps entity id bytes to the Item subclass to build for them
+_ITEM_CLASSES = {ord(entity_id): item_class
+                 for entity_id, item_class in Level.ENTITIES.items()}
+
+
+def _pack_level(level: Level) -> bytes:
+    """ Returns the binary record for a single level.
+
+    Parameters:
+        level: The level to pack.
+    """
+    maze = level.get_maze()
+    rows, cols = maze.get_dimensions()
+    start_row, start_col = level.get_player_start() or (-1, -1)
+    items = level.get_items()
+    doors = maze.get_door_positions()
+
+    parts = [_LEVEL.pack(rows, cols, start_row, start_col, len(items),
+                         len(doors))]
+    parts.extend(_ENTITY.pack(row, col, ord(item.get_id()))
+                 for (row, col), item in items.items())
+    parts.extend(_DOOR.pack(row, col) for row, col in doors)
+    parts.append(bytes(maze.get_cells()))
+    return b''.join(parts)
+
+
+def compile_levels(levels: list[Level], filename: str) -> None:
+    """ Writes the given levels to a compiled .mzb file. The file is written
+        beside the target and then moved into place, so any mapping of an
+        older version of it is left intact.
+
+    Parameters:
+        levels: The levels to write, in order.
+        filename: The path of the file to write.
+    """
+    records = [_pack_level(level) for level in levels]
+    offset = _HEADER.size + _OFFSET.size * len(records)
+    offsets = []
+    for record in records:
+        offsets.append(offset)
+        offset += len(record)
+
+    temp_path = f'{filename}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, len(records)))
+        file.write(b''.join(_OFFSET.pack(offset) for offset in offsets))
+        for record in records:
+            file.write(record)
+    os.replace(temp_path, filename)
+
+
+def compile_game(game_file: str, filename: Optional[str] = None) -> str:
+    """ Compiles a text game file into the .mzb format.
+
+    Parameters:
+        game_file: The path to the text game file.
+        filename: The path to write to. Defaults to the game file's path with
+            a .mzb extension.
+
+    Returns:
+        The path of the compiled file.
+    """
+    if filename is None:
+        filename = os.path.splitext(game_file)[0] + MZB_SUFFIX
+    compile_levels(load_game(game_file), filename)
+    return filename
+
+
+class CompiledLevels(Sequence):
+    """ The levels of a compiled .mzb game file.
+
+        The file is memory-mapped, and each maze uses a view of the mapped
+        tile codes as its buffer, so level data is never copied. Levels are
+        built the first time they are accessed.
+
+        close() unmaps the file, or, if built levels are still in use, stops
+        building levels and leaves it mapped until the last of them is gone.
+        It can also be used as a context manager which closes on exit.
+    """
+    def __init__(self, filename: str) -> None:
+        """ Maps the given compiled game file.
+
+        Parameters:
+            filename: The path to the .mzb file.
+        """
+        self._filename = filename
+        with open(filename, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        magic, num_levels = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{filename}' is not a compiled MazeRunner file")
+        self._offsets = [
+            _OFFSET.unpack_from(self._buffer, _HEADER.size + i * _OFFSET.size)[0]
+            for i in range(num_levels)
+        ]
+        self._levels = {} # Maps level indices to levels built so far
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Level:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('level index out of range')
+
+        level = self._levels.get(index)
+        if level is None:
+            if self._closed:
+                raise ValueError(f"'{self._filename}' has been closed")
+            level = self._levels[index] = self._build_level(self._offsets[index])
+        return level
+
+    def _build_level(self, offset: int) -> Level:
+        """ Builds the level whose record starts at the given offset.
+
+        Parameters:
+            offset: The byte offset of the level record.
+        """
+        buffer = self._buffer
+        rows, cols, start_row, start_col, num_entities, num_doors = \
+            _LEVEL.unpack_from(buffer, offset)
+        offset += _LEVEL.size
+
+        end = offset + num_entities * _ENTITY.size
+        entities = _ENTITY.iter_unpack(buffer[offset:end])
+        offset, end = end, end + num_doors * _DOOR.size
+        doors = _DOOR.iter_unpack(buffer[offset:end])
+        offset, end = end, end + rows * cols
+
+        dimensions = (rows, cols)
+        maze = Maze.from_cells(dimensions, buffer[offset:end], doors)
+        level = Level(dimensions, maze)
+        items = {}
+        for row, col, entity_id in entities:
+            position = (row, col)
+            items[position] = _ITEM_CLASSES[entity_id](position)
+        level.set_items(items)
+        if start_row >= 0:
+            level.add_player_start((start_row, start_col))
+        return level
+
+    def release(self, index: int) -> None:
+        """ Discards the built level at the given index. It will be built from
+            the mapped file again if accessed later.
+
+        Parameters:
+            index: The index of the level to discard.
+        """
+        self._levels.pop(index, None)
+
+    def close(self) -> None:
+        """ Discards the built levels and unmaps the file. If any level built
+            from it is still in use, its maze still views the mapping, which
+            is then unmapped once the last such level is gone.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._levels.clear()
+        self._buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        # Levels still in use keep the mapping alive by themselves
+        self._mmap = None
+
+    def __enter__(self) -> 'CompiledLevels':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"CompiledLevels('{self._filename}')"
+
+
+def load_compiled(filename: str) -> list[Level]:
+    """ Loads every level of a compiled .mzb game file. The file stays mapped
+        until every level loaded from it is gone.
+
+    Parameters:
+        filename: The path to the .mzb file.
+    """
+    with CompiledLevels(filename) as levels:
+        return list(levels)
+
+
+def main():
+    """ Entry-point for compiling text game files. """
+    parser = argparse.ArgumentParser(
+        description='Compile MazeRunner game files into the .mzb format.')
+    parser.add_argument('files', nargs='+', help='text game files to compile')
+    parser.add_argument('-o', '--output-dir', default=None,
+                        help='directory for the compiled files '
+                             '(defaults to alongside each game file)')
+    args = parser.parse_args()
+
+    for game_file in args.files:
+        filename = None
+        if args.output_dir is not None:
+            name = os.path.splitext(os.path.basename(game_file))[0]
+            filename = os.path.join(args.output_dir, name + MZB_SUFFIX)
+        print(f'{game_file} -> {compile_game(game_file, filename)}')
+
+
+if __name__ == '__main__':
+    main()
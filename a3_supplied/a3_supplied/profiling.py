@@ -0,0 +1,224 @@
+""" Low-overhead timing of the phases of a move, for the text and Tk runners.
+
+    Profiling is off unless it is asked for with the --profile[=PATH] option or
+    the MAZERUNNER_PROFILE environment variable (set to 1, or to the JSON file
+    to write). When off nothing is wrapped, so there is no overhead at all.
+    When on, the chosen methods are wrapped at class level and each call's
+    duration is recorded into a fixed-size histogram for its phase, and the
+    histograms are dumped to JSON when the program exits.
+"""
+from __future__ import annotations
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from typing import Iterable, Optional
+
+PROFILE_ENV = 'MAZERUNNER_PROFILE'
+DEFAULT_PROFILE_FILE = 'profile.json'
+
+# Bucket 0 holds durations under 1 microsecond and bucket i > 0 those in
+# [2 ** (i - 1), 2 ** i) microseconds; the last bucket also holds anything
+# longer, so 24 buckets cover up to about 4 seconds.
+NUM_BUCKETS = 24
+
+
+class Histogram:
+    """ Counts of durations in power-of-two buckets, plus exact totals. """
+
+    def __init__(self) -> None:
+        """ Sets up an empty histogram. """
+        self._buckets = [0] * NUM_BUCKETS
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """ Adds one duration to the histogram.
+
+        Parameters:
+            seconds: The duration in seconds.
+        """
+        index = min(int(seconds * 1e6).bit_length(), NUM_BUCKETS - 1)
+        self._buckets[index] += 1
+        self._count += 1
+        self._total += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def get_count(self) -> int:
+        """ Returns the number of durations recorded. """
+        return self._count
+
+    def get_mean(self) -> float:
+        """ Returns the mean duration in milliseconds. """
+        return self._total / self._count * 1000 if self._count else 0.0
+
+    def get_max(self) -> float:
+        """ Returns the longest duration in milliseconds. """
+        return self._max * 1000
+
+    def get_percentile(self, percent: float) -> float:
+        """ Returns an upper bound on the given percentile in milliseconds,
+            i.e. the top of the bucket it falls in. The last bucket has no
+            top, so the longest duration bounds it.
+
+        Parameters:
+            percent: The percentile, from 0 to 100.
+        """
+        target = self._count * percent / 100
+        seen = 0
+        for index, count in enumerate(self._buckets):
+            seen += count
+            if count and seen >= target and index < NUM_BUCKETS - 1:
+                return min(2 ** index / 1000, self.get_max())
+        return self.get_max()
+
+    def to_dict(self) -> dict:
+        """ Returns the histogram in a form that can be written as JSON. """
+        return {
+            'count': self._count,
+            'mean_ms': self.get_mean(),
+            'p50_ms': self.get_percentile(50),
+            'p95_ms': self.get_percentile(95),
+            'max_ms': self.get_max(),
+            'bucket_upper_us': [2 ** index for index in range(NUM_BUCKETS)],
+            'buckets': list(self._buckets),
+        }
+
+
+class Profiler:
+    """ Records the durations of named phases into histograms. """
+
+    def __init__(self) -> None:
+        """ Sets up a profiler which is off. """
+        self.enabled = False
+        self._histograms = {}
+        self._dump_path = None
+
+    def enable(self, dump_path: Optional[str] = None) -> None:
+        """ Switches profiling on.
+
+        Parameters:
+            dump_path: The JSON file to write the histograms to on exit, if any.
+        """
+        if dump_path is not None and self._dump_path is None:
+            atexit.register(self.dump)
+        self._dump_path = dump_path or self._dump_path
+        self.enabled = True
+
+    def record(self, phase: str, seconds: float) -> None:
+        """ Adds a duration to the histogram for a phase.
+
+        Parameters:
+            phase: The name of the phase.
+            seconds: How long it took.
+        """
+        histogram = self._histograms.get(phase)
+        if histogram is None:
+            histogram = self._histograms[phase] = Histogram()
+        histogram.record(seconds)
+
+    def get_histograms(self) -> dict[str, Histogram]:
+        """ Returns the histograms recorded so far, keyed by phase. """
+        return self._histograms
+
+    def instrument(self, cls: type, method_name: str,
+                   phase: Optional[str] = None) -> None:
+        """ Wraps a method of a class so every call to it is timed. Does
+            nothing if profiling is off.
+
+        Parameters:
+            cls: The class whose method to wrap.
+            method_name: The name of the method.
+            phase: The name to record the durations under; defaults to
+                '<class name>.<method name>'.
+        """
+        if not self.enabled:
+            return
+        method = getattr(cls, method_name)
+        if getattr(method, '_profiled', False):
+            return
+        phase = phase or f'{cls.__name__}.{method_name}'
+        record = self.record
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(phase, clock() - start)
+
+        timed._profiled = True
+        setattr(cls, method_name, timed)
+
+    def summary(self) -> str:
+        """ Returns a table of the phases' call counts and durations. """
+        lines = [f'{"phase":<36}{"calls":>7}{"mean":>8}{"p95":>8}{"max":>8}']
+        for phase, histogram in sorted(self._histograms.items()):
+            lines.append(f'{phase:<36}{histogram.get_count():>7}'
+                         f'{histogram.get_mean():>8.2f}'
+                         f'{histogram.get_percentile(95):>8.2f}'
+                         f'{histogram.get_max():>8.2f}')
+        return '\n'.join(lines)
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """ Writes the histograms to a JSON file.
+
+        Parameters:
+            path: The file to write; defaults to the one given to enable.
+        """
+        path = path or self._dump_path
+        if path is None:
+            return
+        with open(path, 'w') as file:
+            json.dump({phase: histogram.to_dict()
+                       for phase, histogram in self._histograms.items()},
+                      file, indent=2)
+
+
+# The profiler shared by every runner in this process
+PROFILER = Profiler()
+
+
+def requested_dump_path(argv: list[str]) -> Optional[str]:
+    """ Returns the JSON file to dump profiles to if profiling was asked for by
+        the --profile[=PATH] option or the environment, else None.
+
+    Parameters:
+        argv: The command line arguments, without the program name.
+    """
+    for arg in argv:
+        if arg == '--profile':
+            return DEFAULT_PROFILE_FILE
+        if arg.startswith('--profile='):
+            return arg.partition('=')[2]
+
+    value = os.environ.get(PROFILE_ENV, '')
+    if value in ('', '0'):
+        return None
+    return DEFAULT_PROFILE_FILE if value == '1' else value
+
+
+def start_profiling(targets: Iterable[tuple[type, str]],
+                    argv: Optional[list[str]] = None) -> bool:
+    """ Switches profiling on and wraps the given methods, if profiling was
+        asked for.
+
+    Parameters:
+        targets: The (class, method name) pairs to time.
+        argv: The command line arguments to check; defaults to sys.argv.
+
+    Returns:
+        True iff profiling is on.
+    """
+    dump_path = requested_dump_path(sys.argv[1:] if argv is None else argv)
+    if dump_path is not None:
+        PROFILER.enable(dump_path)
+        for cls, method_name in targets:
+            PROFILER.instrument(cls, method_name)
+    return PROFILER.enabled
@@ -0,0 +1,327 @@
+""" Finds short routes which collect every coin in a level and then leave it.
+
+    A breadth-first search from the player start and from each coin, over the
+    maze's move tables, gives the number of moves between every pair of them.
+    The order to collect the coins in is then found exactly with Held-Karp
+    dynamic programming over subsets of the coins when there are few of them,
+    or from a nearest-neighbour route improved by 2-opt and Or-opt moves when
+    there are many. Routes minimise the number of moves; they do not consider
+    HP, hunger or thirst.
+"""
+from __future__ import annotations
+from typing import Optional
+
+from a2_solution import Level, Maze, load_game, COIN, MOVE_BITS, MOVE_DELTAS, \
+    MOVE_OFF_GRID_SHIFT
+
+# Held-Karp takes time proportional to 2 ** #coins * #coins ** 2, so beyond
+# this many coins the heuristic is used instead
+HELD_KARP_MAX_COINS = 12
+
+MOVE_KEYS = tuple(MOVE_DELTAS)
+UNREACHABLE = -1
+
+
+def search_moves(moves: bytes, num_cols: int, sources: list[int]
+                 ) -> tuple[list[int], bytearray]:
+    """ Finds the fewest moves from the nearest source to every cell.
+
+    Parameters:
+        moves: The moves table from Maze.get_move_tables.
+        num_cols: The number of columns in the maze.
+        sources: The cells, as row-major indices, to search from.
+
+    Returns:
+        The number of moves to each cell (UNREACHABLE if there is no way
+        there), and for each cell reached, 1 + the index in MOVE_KEYS of the
+        move which reached it (0 for the sources).
+    """
+    steps = []
+    for code, key in enumerate(MOVE_KEYS, start=1):
+        row_delta, col_delta = MOVE_DELTAS[key]
+        steps.append((MOVE_BITS[(row_delta, col_delta)],
+                      row_delta * num_cols + col_delta, code))
+
+    distances = [UNREACHABLE] * len(moves)
+    via = bytearray(len(moves))
+    for source in sources:
+        distances[source] = 0
+    frontier = list(sources)
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for cell in frontier:
+            open_moves = moves[cell]
+            for bit, offset, code in steps:
+                if open_moves & bit:
+                    neighbour = cell + offset
+                    if distances[neighbour] == UNREACHABLE:
+                        distances[neighbour] = distance
+                        via[neighbour] = code
+                        next_frontier.append(neighbour)
+        frontier = next_frontier
+    return distances, via
+
+
+def trace_moves(via: bytearray, num_cols: int, target: int) -> str:
+    """ Returns the moves from a search's source to the target cell.
+
+    Parameters:
+        via: The moves into each cell, from search_moves.
+        num_cols: The number of columns in the maze.
+        target: The cell, as a row-major index, to end at.
+    """
+    path = []
+    cell = target
+    while via[cell]:
+        key = MOVE_KEYS[via[cell] - 1]
+        row_delta, col_delta = MOVE_DELTAS[key]
+        path.append(key)
+        cell -= row_delta * num_cols + col_delta
+    return ''.join(reversed(path))
+
+
+def get_unlocked_moves(maze: Maze) -> bytes:
+    """ Returns the moves table of a maze as it is once its doors unlock,
+        without unlocking them.
+    """
+    # Copies share the move tables, so this builds the unlocked ones once
+    unlocked_maze = maze.copy()
+    unlocked_maze.unlock_door()
+    return unlocked_maze.get_move_tables()[0]
+
+
+def find_exits(maze: Maze) -> dict[int, str]:
+    """ Returns the move key which leaves a maze from each of its exits.
+
+    Parameters:
+        maze: The maze to search.
+
+    Returns:
+        A map from each exit, as a row-major index, to the move leaving the
+        grid from it.
+    """
+    moves, _, exits = maze.get_move_tables()
+    exit_keys = {}
+    for cell, is_exit in enumerate(exits):
+        if not is_exit:
+            continue
+        for key in MOVE_KEYS:
+            off_grid = MOVE_BITS[MOVE_DELTAS[key]] << MOVE_OFF_GRID_SHIFT
+            if moves[cell] & off_grid:
+                exit_keys[cell] = key
+                break
+    return exit_keys
+
+
+def _held_karp(distances: list[list[int]], end_costs: list[int]
+               ) -> list[int]:
+    """ Returns the order to visit every point in which is shortest overall,
+        starting from point 0 and paying the end cost of the last point.
+
+    Parameters:
+        distances: The distance between each pair of points.
+        end_costs: The cost of finishing at each point.
+    """
+    num_coins = len(distances) - 1
+    if num_coins == 0:
+        return []
+    infinity = float('inf')
+    full = (1 << num_coins) - 1
+    # best[mask][last] is the length of the shortest route from the start
+    # through the coins in mask, ending at coin last + 1
+    best = [[infinity] * num_coins for _ in range(full + 1)]
+    previous = [[-1] * num_coins for _ in range(full + 1)]
+    for coin in range(num_coins):
+        best[1 << coin][coin] = distances[0][coin + 1]
+
+    for mask in range(1, full + 1):
+        lengths = best[mask]
+        for last in range(num_coins):
+            length = lengths[last]
+            if length == infinity:
+                continue
+            row = distances[last + 1]
+            for coin in range(num_coins):
+                bit = 1 << coin
+                if mask & bit:
+                    continue
+                candidate = length + row[coin + 1]
+                if candidate < best[mask | bit][coin]:
+                    best[mask | bit][coin] = candidate
+                    previous[mask | bit][coin] = last
+
+    last = min(range(num_coins),
+               key=lambda coin: best[full][coin] + end_costs[coin + 1])
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last + 1)
+        mask, last = mask ^ (1 << last), previous[mask][last]
+    return order[::-1]
+
+
+def _improve(distances: list[list[int]], end_costs: list[int]) -> list[int]:
+    """ Returns a short order to visit every point in, starting from point 0
+        and paying the end cost of the last point, found by taking the nearest
+        point each time and then applying 2-opt and Or-opt moves until none
+        shortens the route.
+
+    Parameters:
+        distances: The distance between each pair of points; it must be
+            symmetric.
+        end_costs: The cost of finishing at each point.
+    """
+    unvisited = set(range(1, len(distances)))
+    route = [0]
+    while unvisited:
+        row = distances[route[-1]]
+        point = min(unvisited, key=row.__getitem__)
+        unvisited.remove(point)
+        route.append(point)
+
+    # The route ends at a virtual point whose distance from each point is that
+    # point's end cost
+    end = len(distances)
+
+    def cost(a: int, b: int) -> int:
+        return end_costs[a] if b == end else distances[a][b]
+
+    route.append(end)
+    improved = True
+    while improved:
+        improved = False
+        # 2-opt: reverse route[i:k + 1]
+        for i in range(1, len(route) - 2):
+            for k in range(i + 1, len(route) - 1):
+                a, b, c, d = route[i - 1], route[i], route[k], route[k + 1]
+                if cost(a, c) + cost(b, d) < cost(a, b) + cost(c, d):
+                    route[i:k + 1] = route[k:i - 1:-1]
+                    improved = True
+
+        # Or-opt: move a run of up to three points elsewhere
+        for length in (1, 2, 3):
+            i = 1
+            while i + length < len(route):
+                a, first = route[i - 1], route[i]
+                last, b = route[i + length - 1], route[i + length]
+                removed = cost(a, first) + cost(last, b) - cost(a, b)
+                rest = route[:i] + route[i + length:]
+                best_gain, best_at = 0, None
+                for j in range(len(rest) - 1):
+                    c, d = rest[j], rest[j + 1]
+                    gain = removed + cost(c, d) - cost(c, first) \
+                        - cost(last, d)
+                    if gain > best_gain:
+                        best_gain, best_at = gain, j + 1
+                if best_at is not None:
+                    route = rest[:best_at] + route[i:i + length] \
+                        + rest[best_at:]
+                    improved = True
+                i += 1
+    return route[1:-1]
+
+
+def _first_steps(moves: bytes, num_cols: int, cell: int
+                 ) -> list[tuple[str, int]]:
+    """ Returns the (move key, cell offset) of each step which can be taken
+        from a cell.
+
+    Parameters:
+        moves: The moves table from Maze.get_move_tables.
+        num_cols: The number of columns in the maze.
+        cell: The cell, as a row-major index, to step from.
+    """
+    steps = []
+    for key in MOVE_KEYS:
+        row_delta, col_delta = MOVE_DELTAS[key]
+        if moves[cell] & MOVE_BITS[(row_delta, col_delta)]:
+            steps.append((key, row_delta * num_cols + col_delta))
+    return steps
+
+
+def solve_level(level: Level, start: Optional[tuple[int, int]] = None) -> str:
+    """ Returns moves which collect every coin in a level and then leave it
+        through a door, in as few moves as found.
+
+    Parameters:
+        level: The level to solve; it is not changed.
+        start: The (row, column) to start from; defaults to the level's player
+            start.
+
+    Raises:
+        ValueError: If a coin or every exit cannot be reached.
+    """
+    maze = level.get_maze()
+    num_cols = maze.get_dimensions()[1]
+    locked_moves = maze.get_move_tables()[0]
+    unlocked_moves = get_unlocked_moves(maze)
+
+    row, col = level.get_player_start() if start is None else start
+    points = [row * num_cols + col] + [
+        row * num_cols + col for (row, col), item in level.get_items().items()
+        if item.get_id() == COIN
+    ]
+
+    exit_keys = find_exits(maze)
+    to_exit, _ = search_moves(unlocked_moves, num_cols, list(exit_keys))
+    # The doors unlock once the last coin is collected, so only the way out is
+    # searched with them unlocked
+    end_costs = [to_exit[point] + 1 if to_exit[point] != UNREACHABLE
+                 else UNREACHABLE for point in points]
+
+    searches = [search_moves(locked_moves, num_cols, [point])
+                for point in points]
+    distances = [[found[point] for point in points]
+                 for found, _ in searches]
+    if UNREACHABLE in distances[0]:
+        raise ValueError('A coin cannot be reached')
+    # Every coin is connected to the start, so an exit can be reached from
+    # one of them iff it can be reached from the start
+    if end_costs[0] == UNREACHABLE:
+        raise ValueError('No exit can be reached')
+
+    if len(points) - 1 <= HELD_KARP_MAX_COINS:
+        order = _held_karp(distances, end_costs)
+    else:
+        order = _improve(distances, end_costs)
+
+    route = [0] + order
+    path = [trace_moves(searches[a][1], num_cols, points[b])
+            for a, b in zip(route, route[1:])]
+    last = points[route[-1]]
+    if len(points) == 1 and not maze.doors_unlocked():
+        # Without coins the doors only unlock once the player has stepped,
+        # so the first step is taken with them locked
+        starts = [(key, last + offset)
+                  for key, offset in _first_steps(locked_moves, num_cols,
+                                                  last)]
+    else:
+        starts = [('', last)]
+
+    best = None
+    for first, cell in starts:
+        found, via = search_moves(unlocked_moves, num_cols, [cell])
+        for exit_cell, exit_key in exit_keys.items():
+            length = len(first) + found[exit_cell]
+            if found[exit_cell] != UNREACHABLE and \
+                    (best is None or length < best[0]):
+                best = (length, first + trace_moves(via, num_cols, exit_cell)
+                        + exit_key)
+    if best is None:
+        raise ValueError('No exit can be reached')
+    path.append(best[1])
+    return ''.join(path)
+
+
+def solve_game(game_file: str) -> str:
+    """ Returns moves which complete every level of a game in turn.
+
+    Parameters:
+        game_file: Path to the file from which the game levels are loaded.
+
+    Raises:
+        ValueError: If a level cannot be completed.
+    """
+    return ''.join(solve_level(level) for level in load_game(game_file))
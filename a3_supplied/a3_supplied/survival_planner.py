@@ -0,0 +1,423 @@
+""" Plans the fastest way through a level which the player survives.
+
+    The search is over states of (position, items left in the level, doors
+    unlocked, moves made modulo 5, HP, hunger, thirst, and the number of each
+    consumable held). It is an A* search by the number of moves, with a lower
+    bound on the moves left from the coins still to collect, so the first plan
+    to reach an exit is the fastest.
+
+    Consumables are used lazily: only just before a move which would otherwise
+    lose, and only as many as that move needs. Every consumable does at least
+    as much good later as earlier, since HP only falls and hunger and thirst
+    only rise between uses, so nothing is lost by waiting.
+
+    States are pruned in two ways without losing any plan:
+        - A transposition table keeps, for each (position, items left, doors
+          unlocked, moves modulo 5), only the stats and holdings not dominated
+          by another reached as fast: one with at least the HP and consumables
+          and no more hunger or thirst can do anything the other can.
+        - A state is dropped if, even using every consumable it holds or could
+          still pick up, it cannot survive the fewest moves it needs to collect
+          the remaining coins and reach an exit.
+    When the search runs out of states, the level has been proved not to be
+    survivable from where it started.
+"""
+from __future__ import annotations
+import heapq
+import operator
+from typing import Optional
+
+from a2_solution import Level, load_game, COIN, MAX_HEALTH, MAX_HUNGER, \
+    MAX_THIRST, POTION_AMOUNT, APPLE_AMOUNT, HONEY_AMOUNT, WATER_AMOUNT, \
+    CANDY_HEALTH_AMOUNT, MOVE_BITS, MOVE_DELTAS
+from route_solver import MOVE_KEYS, UNREACHABLE, search_moves, \
+    get_unlocked_moves, find_exits
+
+# The consumables tracked, in the order of their counts in a state
+CONSUMABLES = ('Potion', 'Apple', 'Honey', 'Water', 'Candy')
+POTION_INDEX, APPLE_INDEX, HONEY_INDEX, WATER_INDEX, CANDY_INDEX = range(5)
+
+# The index of the first consumable count in a state's label
+_COUNTS = 4
+
+
+def _use_command(item_name: str) -> str:
+    """ Returns the text runner's command to use an item. """
+    return f'i {item_name}'
+
+
+def _dominates(label: tuple, other: tuple) -> bool:
+    """ Returns True iff a state's label is at least as good as another's in
+        every respect. Labels are (-moves made, HP, -hunger, -thirst,
+        *consumable counts); reaching a state sooner is better as the same
+        moves can follow.
+    """
+    return all(map(operator.ge, label, other))
+
+
+def _prepare(health: int, hunger: int, thirst: int, counts: tuple[int, ...],
+             tick: bool, damage: int
+             ) -> list[tuple[tuple[str, ...], int, int, int, tuple[int, ...]]]:
+    """ Returns each way to use the fewest consumables before a move so the
+        player survives it.
+
+    Parameters:
+        health, hunger, thirst: The player's stats before the move.
+        counts: The number of each consumable held.
+        tick: Whether hunger and thirst go up with this move.
+        damage: The HP lost to the move, including the 1 every move costs.
+
+    Returns:
+        A list of (commands, HP, hunger, thirst, counts) after using the
+        consumables, which is empty if no way survives.
+    """
+    # Each way to keep hunger below its maximum, as (commands, hunger, HP
+    # change, counts)
+    if hunger + tick < MAX_HUNGER:
+        foods = [((), hunger, 0, counts)]
+    else:
+        foods = []
+        for index, amount in ((APPLE_INDEX, APPLE_AMOUNT),
+                              (HONEY_INDEX, HONEY_AMOUNT),
+                              (CANDY_INDEX, None)):
+            if not counts[index]:
+                continue
+            eaten = list(counts)
+            eaten[index] -= 1
+            if amount is None:
+                new_hunger, health_change = 0, CANDY_HEALTH_AMOUNT
+            else:
+                new_hunger, health_change = max(hunger + amount, 0), 0
+            if new_hunger + tick < MAX_HUNGER:
+                foods.append(((_use_command(CONSUMABLES[index]),), new_hunger,
+                              health_change, tuple(eaten)))
+
+    drinks = ()
+    if thirst + tick >= MAX_THIRST:
+        if not counts[WATER_INDEX]:
+            return []
+        thirst = max(thirst + WATER_AMOUNT, 0)
+        drinks = (_use_command(CONSUMABLES[WATER_INDEX]),)
+
+    options = []
+    for food, new_hunger, health_change, eaten in foods:
+        # Potions go first, so eating candy cannot lose
+        potions = 0
+        new_health = health
+        while new_health + health_change <= damage:
+            if potions == eaten[POTION_INDEX] or new_health == MAX_HEALTH:
+                break
+            potions += 1
+            new_health = min(new_health + POTION_AMOUNT, MAX_HEALTH)
+        if new_health + health_change <= damage:
+            continue
+        used = list(eaten)
+        used[POTION_INDEX] -= potions
+        if drinks:
+            used[WATER_INDEX] -= 1
+        commands = (_use_command(CONSUMABLES[POTION_INDEX]),) * potions \
+            + food + drinks
+        options.append((commands, new_health + health_change, new_hunger,
+                        thirst, tuple(used)))
+    return options
+
+
+class _Search:
+    """ The fixed facts about a level which the search needs. """
+
+    def __init__(self, level: Level) -> None:
+        """ Numbers the level's items and finds the distances needed to bound
+            how many moves are left.
+
+        Parameters:
+            level: The level to plan through; it is not changed.
+        """
+        maze = level.get_maze()
+        self.num_cols = num_cols = maze.get_dimensions()[1]
+        self.locked_moves, self.damage, _ = maze.get_move_tables()
+        self.unlocked_moves = get_unlocked_moves(maze)
+        self.exit_keys = find_exits(maze)
+        self.doors_unlocked = maze.doors_unlocked()
+
+        # Each item is a bit in the mask of items left; item_at maps cells to
+        # (bit, consumable index or None)
+        self.item_at = {}
+        self.coin_mask = 0
+        self.kind_masks = [0] * len(CONSUMABLES)
+        coin_cells = []
+        for (row, col), item in level.get_items().items():
+            if item.get_id() == COIN:
+                kind = None
+                coin_cells.append(row * num_cols + col)
+            elif item.get_name() in CONSUMABLES:
+                kind = CONSUMABLES.index(item.get_name())
+            else:
+                continue
+            bit = 1 << len(self.item_at)
+            self.item_at[row * num_cols + col] = (bit, kind)
+            if kind is None:
+                self.coin_mask |= bit
+            else:
+                self.kind_masks[kind] |= bit
+        self.all_items = (1 << len(self.item_at)) - 1
+
+        # Unlocking only opens moves, so distances with the doors unlocked are
+        # never more than the true ones
+        self.to_exit, _ = search_moves(self.unlocked_moves, num_cols,
+                                       list(self.exit_keys))
+        self.coin_cells = coin_cells
+        self.coins = []
+        for cell in coin_cells:
+            bit = self.item_at[cell][0]
+            from_coin, _ = search_moves(self.unlocked_moves, num_cols, [cell])
+            self.coins.append((bit, from_coin, self.to_exit[cell]))
+        # Maps each set of coins left to its _tree_length, and each (cell, set
+        # of coins left) to its moves_left
+        self._tree_lengths = {}
+        self._moves_left = {}
+
+        self.steps = []
+        for key in MOVE_KEYS:
+            row_delta, col_delta = MOVE_DELTAS[key]
+            self.steps.append((MOVE_BITS[(row_delta, col_delta)],
+                               row_delta * num_cols + col_delta, key))
+
+    def moves_left(self, cell: int, mask: int) -> int:
+        """ Returns a lower bound on the moves needed from a cell to collect
+            the coins left and reach an exit. Any such route is a path from the
+            cell to a coin and then through a tree spanning the other coins and
+            the exits, so it is at least as long as the shortest first step
+            plus a minimum spanning tree.
+        """
+        coins_left = mask & self.coin_mask
+        if not coins_left:
+            return self.to_exit[cell]
+        moves = self._moves_left.get((cell, coins_left))
+        if moves is None:
+            nearest = min(from_coin[cell] for bit, from_coin, _ in self.coins
+                          if coins_left & bit)
+            moves = nearest + self._tree_length(coins_left)
+            self._moves_left[(cell, coins_left)] = moves
+        return moves
+
+    def _tree_length(self, coins_left: int) -> int:
+        """ Returns the length of a minimum spanning tree over the coins left
+            and the exits, taken together as one point.
+        """
+        length = self._tree_lengths.get(coins_left)
+        if length is not None:
+            return length
+        # Prim's algorithm, growing the tree from the exits
+        coins = self.coins
+        furthest = {index: coins[index][2] for index, (bit, _, _)
+                    in enumerate(coins) if coins_left & bit}
+        length = 0
+        while furthest:
+            index = min(furthest, key=furthest.__getitem__)
+            length += furthest.pop(index)
+            from_coin = coins[index][1]
+            for other in furthest:
+                distance = from_coin[self.coin_cells[other]]
+                if distance < furthest[other]:
+                    furthest[other] = distance
+        self._tree_lengths[coins_left] = length
+        return length
+
+    def can_survive(self, mask: int, phase: int, label: tuple, moves: int
+                    ) -> bool:
+        """ Returns False if a state is certain to lose before leaving the
+            level, even using every consumable it holds or can still collect.
+
+        Parameters:
+            mask, phase, label: The items left, moves made modulo 5 and label
+                of the state.
+            moves: The fewest moves left, from moves_left.
+        """
+        if moves == 0:
+            return True
+        kind_masks = self.kind_masks
+
+        def available(index: int) -> int:
+            return label[_COUNTS + index] \
+                + (mask & kind_masks[index]).bit_count()
+
+        if label[1] + POTION_AMOUNT * available(POTION_INDEX) <= moves:
+            return False
+        ticks = (phase + moves) // 5
+        if -label[3] + ticks + WATER_AMOUNT * available(WATER_INDEX) \
+                >= MAX_THIRST:
+            return False
+        if available(CANDY_INDEX):
+            return True
+        return -label[2] + ticks + APPLE_AMOUNT * available(APPLE_INDEX) \
+            + HONEY_AMOUNT * available(HONEY_INDEX) < MAX_HUNGER
+
+    def is_connected(self, cell: int) -> bool:
+        """ Returns True iff every coin and an exit can be reached from a cell
+            once the doors are unlocked.
+        """
+        return self.to_exit[cell] != UNREACHABLE and all(
+            from_coin[cell] != UNREACHABLE for _, from_coin, _ in self.coins)
+
+
+def _plan(level: Level, start: tuple[int, int], stats: tuple[int, int, int],
+          counts: tuple[int, ...], num_moves: int
+          ) -> Optional[tuple[list[str], tuple[int, int, int],
+                              tuple[int, ...], int]]:
+    """ Finds the fastest survivable plan through a level.
+
+    Returns:
+        The (commands, final stats, final consumable counts, moves made), or
+        None if the level cannot be survived.
+    """
+    search = _Search(level)
+    steps, item_at, exit_keys = search.steps, search.item_at, search.exit_keys
+    coin_mask, damage = search.coin_mask, search.damage
+    num_cols = search.num_cols
+
+    row, col = start
+    cell = row * num_cols + col
+    if not search.is_connected(cell):
+        return None
+    mask = search.all_items
+    unlocked = search.doors_unlocked
+    phase = num_moves % 5
+    health, hunger, thirst = stats
+    label = (0, health, -hunger, -thirst, *counts)
+
+    # Each node is (parent node, commands from the parent), so plans are
+    # rebuilt by walking back from the exit
+    nodes = [(None, ())]
+    table = {(cell, mask, unlocked, phase): [label]}
+    # Entries are (lower bound on total moves, -moves, tie breaker, state),
+    # so of the states which could finish soonest, the furthest along is
+    # taken first
+    queue = [(search.moves_left(cell, mask), 0, 0, cell, mask, unlocked, phase,
+              label, 0)]
+    pushed = 1
+    while queue:
+        *_, cell, mask, unlocked, phase, label, node = heapq.heappop(queue)
+        if label not in table[(cell, mask, unlocked, phase)]:
+            continue  # Dominated since it was queued
+        if unlocked and cell in exit_keys:
+            plan = [exit_keys[cell]]
+            while node is not None:
+                node, commands = nodes[node]
+                plan[:0] = commands
+            return (plan, (label[1], -label[2], -label[3]), label[_COUNTS:],
+                    -label[0])
+
+        moves = search.unlocked_moves if unlocked else search.locked_moves
+        open_moves = moves[cell]
+        new_phase = (phase + 1) % 5
+        tick = new_phase == 0
+        health, hunger, thirst = label[1], -label[2], -label[3]
+        counts = label[_COUNTS:]
+        for bit, offset, key in steps:
+            if not open_moves & bit:
+                continue
+            target = cell + offset
+            cost = 1 + damage[target]
+            item = item_at.get(target)
+            new_mask = mask
+            if item is not None and mask & item[0]:
+                new_mask = mask ^ item[0]
+            new_unlocked = unlocked or not new_mask & coin_mask
+            key_state = (target, new_mask, new_unlocked, new_phase)
+            moves_left = search.moves_left(target, new_mask)
+
+            for commands, new_health, new_hunger, new_thirst, new_counts \
+                    in _prepare(health, hunger, thirst, counts, tick, cost):
+                if new_mask != mask and item[1] is not None:
+                    held = list(new_counts)
+                    held[item[1]] += 1
+                    new_counts = tuple(held)
+                new_label = (label[0] - 1, new_health - cost,
+                             -min(new_hunger + tick, MAX_HUNGER),
+                             -min(new_thirst + tick, MAX_THIRST),
+                             *new_counts)
+                if not search.can_survive(new_mask, new_phase, new_label,
+                                          moves_left) \
+                        or not _record(table, key_state, new_label):
+                    continue
+                nodes.append((node, commands + (key,)))
+                heapq.heappush(queue, (moves_left - new_label[0],
+                                       new_label[0], pushed, target, new_mask,
+                                       new_unlocked, new_phase, new_label,
+                                       len(nodes) - 1))
+                pushed += 1
+    return None
+
+
+def _record(table: dict, key: tuple, label: tuple) -> bool:
+    """ Adds a state's label to the transposition table unless a label
+        already there dominates it, dropping any labels it dominates.
+
+    Returns:
+        True iff the label was added.
+    """
+    labels = table.get(key)
+    if labels is None:
+        table[key] = [label]
+        return True
+    for other in labels:
+        if _dominates(other, label):
+            return False
+    labels[:] = [other for other in labels if not _dominates(label, other)]
+    labels.append(label)
+    return True
+
+
+def plan_level(level: Level, start: Optional[tuple[int, int]] = None,
+               stats: tuple[int, int, int] = (MAX_HEALTH, 0, 0),
+               inventory: Optional[dict[str, int]] = None,
+               num_moves: int = 0) -> Optional[list[str]]:
+    """ Returns the fastest plan which collects every coin in a level and
+        leaves it without losing, or None if there is no such plan.
+
+    Parameters:
+        level: The level to plan through; it is not changed.
+        start: The (row, column) to start from; defaults to the level's player
+            start.
+        stats: The (HP, hunger, thirst) to start with.
+        inventory: How many of each item, by name, the player holds.
+        num_moves: The moves already made, which decides when hunger and
+            thirst next go up.
+
+    Returns:
+        The commands in the order to give them to the text runner: a move key,
+        or 'i <item name>' to use an item. The fewest moves are made, and no
+        more consumables are used than those moves need.
+    """
+    inventory = inventory or {}
+    counts = tuple(inventory.get(name, 0) for name in CONSUMABLES)
+    start = level.get_player_start() if start is None else start
+    result = _plan(level, start, stats, counts, num_moves)
+    return None if result is None else result[0]
+
+
+def plan_game(game_file: str) -> Optional[list[str]]:
+    """ Returns a plan which wins a game, taking the fastest survivable plan
+        through each level in turn, or None if some level cannot be survived
+        that way.
+
+        Each level is planned from the stats and items the plan for the one
+        before leaves the player with, so a slower plan through an earlier
+        level could sometimes save a later one.
+
+    Parameters:
+        game_file: Path to the file from which the game levels are loaded.
+    """
+    stats = (MAX_HEALTH, 0, 0)
+    counts = (0,) * len(CONSUMABLES)
+    num_moves = 0
+    plan = []
+    for level in load_game(game_file):
+        result = _plan(level, level.get_player_start(), stats, counts,
+                       num_moves)
+        if result is None:
+            return None
+        commands, stats, counts, moves = result
+        plan.extend(commands)
+        num_moves += moves
+    return plan
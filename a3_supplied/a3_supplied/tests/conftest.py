@@ -0,0 +1,17 @@
+""" Puts the game modules on the path and points the tests at its games. """
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+GAMES = [os.path.join(ROOT, 'games', name)
+         for name in sorted(os.listdir(os.path.join(ROOT, 'games')))]
+
+
+@pytest.fixture(params=GAMES, ids=os.path.basename)
+def game_file(request) -> str:
+    """ Each of the supplied game files. """
+    return request.param
@@ -0,0 +1,89 @@
+""" Tests that Model.apply_moves has the same effect as move_player. """
+import random
+
+import pytest
+
+from a2_solution import Model, MoveSummary, MOVE_DELTAS
+from route_solver import solve_game
+
+
+def _snapshot(model: Model) -> tuple:
+    """ Returns everything about a game that a move can change. """
+    player = model.get_player()
+    items = player.get_inventory().get_items()
+    state = (model.get_level_num(), model.has_won(), model.has_lost(),
+             model.get_num_moves(), model.did_level_up(),
+             player.get_position(), model.get_player_stats(),
+             {name: len(stack) for name, stack in items.items()})
+    if not model.has_won():
+        state += (sorted(model.get_current_items()),
+                  str(model.get_current_maze()))
+    return state
+
+
+def _move_each(model: Model, moves: str) -> tuple[int, str]:
+    """ Makes moves one at a time with move_player, stopping where apply_moves
+        stops, and returns how many were made and why it stopped.
+    """
+    if model.has_won():
+        return 0, MoveSummary.WON
+    if model.has_lost():
+        return 0, MoveSummary.LOST
+    for count, move in enumerate(moves, start=1):
+        model.move_player(MOVE_DELTAS[move])
+        if model.has_won():
+            return count, MoveSummary.WON
+        if model.has_lost():
+            return count, MoveSummary.LOST
+        if model.did_level_up():
+            return count, MoveSummary.LEVEL_UP
+    return len(moves), None
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_apply_moves_matches_move_player(game_file, seed):
+    rng = random.Random(seed)
+    fast, slow = Model(game_file), Model(game_file)
+    fast_events, slow_events = [], []
+    fast.subscribe(fast_events.extend)
+    slow.subscribe(slow_events.extend)
+    for _ in range(8):
+        moves = ''.join(rng.choice('wasd') for _ in range(rng.randint(0, 60)))
+        summary = fast.apply_moves(moves)
+        num_moves, outcome = _move_each(slow, moves)
+        assert (summary.get_num_moves(), summary.outcome) == \
+            (num_moves, outcome)
+        assert summary.stats == slow.get_player_stats()
+        assert _snapshot(fast) == _snapshot(slow)
+        assert repr(fast_events) == repr(slow_events)
+        if outcome in (MoveSummary.WON, MoveSummary.LOST):
+            break
+
+
+def test_apply_moves_through_levels(game_file):
+    rng = random.Random(0)
+    moves = solve_game(game_file)
+    fast, slow = Model(game_file), Model(game_file)
+    outcomes = set()
+    while moves:
+        size = rng.randint(1, 40)
+        chunk, moves = moves[:size], moves[size:]
+        summary = fast.apply_moves(chunk)
+        num_moves, outcome = _move_each(slow, chunk)
+        assert (summary.get_num_moves(), summary.outcome) == \
+            (num_moves, outcome)
+        assert _snapshot(fast) == _snapshot(slow)
+        outcomes.add(outcome)
+        # Carry on with what was left after a level up
+        moves = chunk[num_moves:] + moves
+        if outcome in (MoveSummary.WON, MoveSummary.LOST):
+            break
+    assert outcomes & {MoveSummary.LEVEL_UP, MoveSummary.WON, MoveSummary.LOST}
+
+
+def test_apply_moves_rejects_bad_keys(game_file):
+    model = Model(game_file)
+    before = _snapshot(model)
+    with pytest.raises(ValueError):
+        model.apply_moves('wwx')
+    assert _snapshot(model) == before
@@ -0,0 +1,65 @@
+""" Tests that BatchSimulator plays each player as the Model would. """
+import random
+
+import pytest
+
+import batch_sim
+from a2_solution import Model, load_game, MOVE_DELTAS
+from route_solver import solve_level
+
+NUM_PLAYERS = 40
+
+
+def _play(game_file: str, level_num: int, moves: str,
+          stats: tuple[int, int, int]) -> tuple:
+    """ Plays moves on one level with the Model and returns the result in the
+        form BatchSimulator reports it.
+    """
+    model = Model(game_file)
+    for _ in range(level_num):
+        model.level_up()
+    player = model.get_player()
+    player._health, player._hunger, player._thirst = stats
+    status = batch_sim.LOST if model.has_lost() else batch_sim.PLAYING
+    for move in moves:
+        if status != batch_sim.PLAYING:
+            break
+        try:
+            model.move_player(MOVE_DELTAS[move])
+        except IndexError:
+            status = batch_sim.INVALID
+        else:
+            if model.did_level_up() or model.has_won():
+                # The player is then on the next level, so only the status
+                # and the stats carried over are compared
+                return batch_sim.ESCAPED, model.get_player_stats()
+            if model.has_lost():
+                status = batch_sim.LOST
+    collected = sorted(f"{item.get_name()}{item.get_position()}"
+                       for stack in player.get_inventory().get_items().values()
+                       for item in stack)
+    return (status, model.get_player_stats(), player.get_position(),
+            model.get_num_moves(), collected)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_batch_matches_model(game_file, seed):
+    rng = random.Random(seed)
+    for level_num, level in enumerate(load_game(game_file)):
+        stats = (rng.randint(1, 100), rng.randint(0, 9), rng.randint(0, 9))
+        moves = [''.join(rng.choice('wasd')
+                         for _ in range(rng.randint(0, 150)))
+                 for _ in range(NUM_PLAYERS - 1)]
+        moves.append(solve_level(level))
+        sim = batch_sim.BatchSimulator(level, NUM_PLAYERS, stats=stats)
+        sim.run(batch_sim.encode_moves(moves))
+        for player, player_moves in enumerate(moves):
+            status = int(sim.status[player])
+            if status == batch_sim.ESCAPED:
+                got = status, sim.get_stats(player)
+            else:
+                got = (status, sim.get_stats(player), sim.get_position(player),
+                       int(sim.num_moves[player]),
+                       sorted(f"{name}{position}" for position, name
+                              in sim.get_collected(player)))
+            assert got == _play(game_file, level_num, player_moves, stats)
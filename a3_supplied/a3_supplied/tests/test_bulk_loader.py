@@ -0,0 +1,41 @@
+""" Tests for loading game files in a process pool. """
+import pytest
+
+from a2_solution import load_game
+from bulk_loader import (level_from_payload, level_to_payload, load_games,
+                         split_levels)
+from conftest import GAMES
+
+
+def _describe(level) -> tuple:
+    """ Returns the parts of a level compared by these tests. """
+    return (str(level.get_maze()), repr(level.get_items()),
+            level.get_player_start())
+
+
+def test_load_games_matches_serial_in_input_order():
+    filenames = list(reversed(GAMES)) + GAMES[:1]
+    loaded = load_games(filenames, processes=2, chunksize=1)
+    assert len(loaded) == len(filenames)
+    for filename, levels in zip(filenames, loaded):
+        assert ([_describe(level) for level in levels]
+                == [_describe(level) for level in load_game(filename)])
+
+
+def test_payloads_rebuild_identical_levels(game_file):
+    serial = load_game(game_file)
+    assert len(split_levels(game_file)) == len(serial)
+    for level in serial:
+        payload = level_to_payload(level)
+        assert _describe(level_from_payload(payload)) == _describe(level)
+
+    payloads = load_games([game_file], processes=2, payloads=True)[0]
+    assert ([_describe(level_from_payload(payload)) for payload in payloads]
+            == [_describe(level) for level in serial])
+
+
+def test_bad_file_raises(tmp_path):
+    bad = tmp_path / 'bad.txt'
+    bad.write_text('Maze 1 - 2 x\n##\n')
+    with pytest.raises(ValueError):
+        load_games([GAMES[0], str(bad)], processes=2, chunksize=1)
@@ -0,0 +1,76 @@
+""" Tests for the cached HP cost fields. """
+import gc
+
+from a2_solution import Level, load_game
+from distance_fields import DistanceFieldCache, find_field
+
+# The lava square costs 5 HP more to step onto than going round it
+SMALL_ROWS = ['#####',
+              '# L #',
+              '#   #',
+              '#####']
+
+
+def _small_level() -> Level:
+    level = Level((len(SMALL_ROWS), len(SMALL_ROWS[0])))
+    for row in SMALL_ROWS:
+        level.add_row(row)
+    return level
+
+
+def test_lava_weighted_costs():
+    costs, reaches_door = find_field(_small_level(), (1, 3))
+    # The costs from the open cells; the player never stands on a wall
+    expected = [[4, 1, 0],
+                [3, 2, 1]]
+    assert [list(costs[row * 5 + 1:row * 5 + 4]) for row in (1, 2)] == \
+        expected
+    assert not reaches_door
+
+
+def test_cost_and_next_move():
+    cache = DistanceFieldCache()
+    level = _small_level()
+    assert cache.get_cost(level, (1, 1), (1, 3)) == 4
+    assert cache.get_cost(level, (0, 0), (1, 3)) is None
+    # Going round the lava is cheaper than across it
+    assert cache.next_move(level, (1, 1), (1, 3)) == 's'
+    assert cache.next_move(level, (1, 3), (1, 3)) is None
+
+
+def test_lru_eviction():
+    cache = DistanceFieldCache(max_fields=2)
+    level = _small_level()
+    for target in ((1, 1), (1, 3), (2, 2)):
+        cache.get_field(level, target)
+    assert len(cache) == 2 and cache.misses == 3
+    cache.get_field(level, (2, 2))
+    assert cache.hits == 1
+    cache.get_field(level, (1, 1))
+    assert cache.misses == 4
+
+
+def test_fields_after_unlock_match_fresh(game_file):
+    for level in load_game(game_file):
+        cache = DistanceFieldCache(max_fields=10_000)
+        num_rows, num_cols = level.get_dimensions()
+        targets = [(row, col) for row in range(num_rows)
+                   for col in range(num_cols)]
+        for target in targets:
+            cache.get_field(level, target)
+        level.get_maze().unlock_door()
+        for target in targets:
+            assert cache.get_field(level, target) == \
+                find_field(level, target)[0]
+        if level.get_maze().get_door_positions():
+            assert cache.invalidations > 0
+
+
+def test_fields_go_with_level():
+    cache = DistanceFieldCache()
+    level = _small_level()
+    cache.get_field(level, (1, 3))
+    assert len(cache) == 1
+    del level
+    gc.collect()
+    assert len(cache) == 0
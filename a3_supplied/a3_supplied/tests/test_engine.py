@@ -0,0 +1,84 @@
+""" Tests that the headless engine plays exactly as the model does. """
+import os
+import random
+
+import pytest
+
+from a2_solution import Model, MOVE_DELTAS
+from engine import Engine
+from survival_planner import plan_game
+
+GAMES = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'games')
+ITEM_NAMES = ['Potion', 'Apple', 'Water', 'Honey', 'Candy']
+
+
+def _random_script(seed: int, length: int) -> list[str]:
+    """ Returns a reproducible mix of moves and item uses. """
+    rng = random.Random(seed)
+    return [f'i {rng.choice(ITEM_NAMES)}' if rng.random() < 0.05
+            else rng.choice(list(MOVE_DELTAS)) for _ in range(length)]
+
+
+def _play_engine(engine: Engine, script: list[str]) -> None:
+    """ Plays a script through the engine, runs of moves by step_many and
+        the rest by step or use_item.
+    """
+    moves = ''
+    for command in script + ['']:
+        if command in MOVE_DELTAS and len(moves) < 7:
+            moves += command
+            continue
+        if len(moves) == 1:
+            engine.step(moves)
+        else:
+            engine.step_many(moves)
+        moves = command if command in MOVE_DELTAS else ''
+        if command.startswith('i '):
+            engine.use_item(command.partition(' ')[2])
+
+
+def _play_model(model: Model, script: list[str]) -> None:
+    """ Plays a script through the model one command at a time. """
+    for command in script:
+        if model.has_won() or model.has_lost():
+            break
+        if command in MOVE_DELTAS:
+            model.move_player(MOVE_DELTAS[command])
+        else:
+            model.use_item(command.partition(' ')[2])
+
+
+def _assert_same(engine: Engine, model: Model) -> None:
+    """ Asserts the engine's game is in the same state as the model. """
+    assert engine.get_position() == model.get_player().get_position()
+    assert engine.get_stats() == model.get_player_stats()
+    assert engine.get_model().get_level_num() == model.get_level_num()
+    assert engine.get_inventory_counts() == {
+        name: len(items) for name, items in
+        model.get_player_inventory().get_items().items()}
+    assert (engine.get_model().has_won(), engine.get_model().has_lost()) \
+        == (model.has_won(), model.has_lost())
+    assert engine.is_over() == (model.has_won() or model.has_lost())
+    if not model.has_won():
+        assert repr(engine.get_items()) == repr(model.get_current_items())
+
+
+# Short scripts end mid-game, long ones outlast the player's thirst
+@pytest.mark.parametrize('length', [30, 400])
+@pytest.mark.parametrize('seed', range(3))
+def test_random_script_matches_model(game_file, seed, length):
+    script = _random_script(seed, length)
+    engine, model = Engine(game_file), Model(game_file)
+    _play_engine(engine, script)
+    _play_model(model, script)
+    _assert_same(engine, model)
+
+
+def test_winning_script_matches_model():
+    game_file = os.path.join(GAMES, 'game1.txt')
+    script = plan_game(game_file)
+    engine, model = Engine(game_file), Model(game_file)
+    _play_engine(engine, script)
+    _play_model(model, script)
+    _assert_same(engine, model)
+    assert engine.get_state()['won'] and model.has_won()
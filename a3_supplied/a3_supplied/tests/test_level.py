@@ -0,0 +1,31 @@
+""" Tests for building levels row by row. """
+from a2_solution import LazyLevels, Level, load_game
+
+
+def test_rows_are_bounded_by_dimensions():
+    level = Level((2, 3))
+    for row in ('#CP#C', '# M', 'CCC', 'PCC'):
+        level.add_row(row)
+    assert str(level.get_maze()) == '#  \n#  '
+    assert len(level.get_maze().get_cells()) == 6
+    assert sorted(level.get_items()) == [(0, 1), (1, 2)]
+    assert level.get_player_start() == (0, 2)
+    assert level.get_maze().get_num_rows() == 2
+
+
+def test_lazy_levels_match_eager(game_file):
+    lazy, eager = LazyLevels(game_file), load_game(game_file)
+    assert len(lazy) == len(eager)
+    for lazy_level, level in zip(lazy, eager):
+        assert str(lazy_level.get_maze()) == str(level.get_maze())
+        assert repr(lazy_level.get_items()) == repr(level.get_items())
+        assert lazy_level.get_player_start() == level.get_player_start()
+
+
+def test_lazy_levels_ignore_later_edits(game_file, tmp_path):
+    copy = tmp_path / 'game.txt'
+    copy.write_bytes(open(game_file, 'rb').read())
+    lazy = LazyLevels(str(copy))
+    copy.write_text('Maze 1 - 1 1\n#\n')
+    assert [str(level.get_maze()) for level in lazy] == \
+        [str(level.get_maze()) for level in load_game(game_file)]
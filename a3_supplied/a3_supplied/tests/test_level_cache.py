@@ -0,0 +1,76 @@
+""" Tests for the cache of parsed levels. """
+import os
+import pickle
+
+from a2_solution import load_game
+from level_cache import LevelCache
+
+
+def _strip(obj, *names):
+    """ Pickles obj without some attributes, as an older version would. """
+    state = pickle.loads(pickle.dumps(obj))
+    for name in names:
+        del state.__dict__[name]
+    return pickle.dumps(state)
+
+
+def test_older_pickles_load(game_file):
+    level = load_game(game_file)[0]
+    old = pickle.loads(_strip(level, '_owns_items', '_item_codes'))
+    assert old.get_item_codes() == level.get_item_codes()
+    old_maze = pickle.loads(_strip(level.get_maze(), '_rows', '_move_tables'))
+    assert old_maze.get_move_tables() == level.get_maze().get_move_tables()
+    assert len(old_maze.get_tiles()) == level.get_dimensions()[0]
+
+
+def test_disk_cache_round_trip(game_file, tmp_path):
+    expected = [str(level) for level in load_game(game_file)]
+    LevelCache(cache_dir=str(tmp_path)).get_levels(game_file)
+    levels = LevelCache(cache_dir=str(tmp_path)).get_levels(game_file)
+    assert [str(level) for level in levels] == expected
+
+
+LEVEL = 'Maze 1 - 3 4\n####\n#P{}D\n####\n'
+
+
+def _write(path, text: str, mtime_ns: int) -> None:
+    """ Writes a game file and sets its modification time. """
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_edited_file_is_parsed_again(tmp_path):
+    game = tmp_path / 'game.txt'
+    _write(game, LEVEL.format(' '), 1_000_000_000)
+    cache = LevelCache()
+    assert not cache.get_levels(str(game))[0].get_items()
+    _write(game, LEVEL.format('C'), 2_000_000_000)
+    assert list(cache.get_levels(str(game))[0].get_items()) == [(1, 2)]
+    assert cache.misses == 2
+
+
+def test_touched_file_is_reused(tmp_path):
+    game = tmp_path / 'game.txt'
+    _write(game, LEVEL.format('C'), 1_000_000_000)
+    cache = LevelCache()
+    cache.get_levels(str(game))
+    os.utime(game, ns=(2_000_000_000, 2_000_000_000))
+    levels = cache.get_levels(str(game))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert list(levels[0].get_items()) == [(1, 2)]
+
+
+def test_oldest_entry_is_evicted(tmp_path):
+    cache = LevelCache(max_entries=2)
+    games = []
+    for index in range(3):
+        game = tmp_path / f'game{index}.txt'
+        _write(game, LEVEL.format(' '), 1_000_000_000)
+        games.append(str(game))
+        cache.get_levels(str(game))
+    assert len(cache) == 2
+    cache.get_levels(games[2])
+    cache.get_levels(games[1])
+    assert cache.misses == 3
+    cache.get_levels(games[0])
+    assert cache.misses == 4
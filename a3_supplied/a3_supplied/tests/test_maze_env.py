@@ -0,0 +1,49 @@
+""" Tests for the MazeRunner environments. """
+import numpy as np
+import pytest
+
+from a2_solution import Model
+from maze_env import MazeEnv, VectorMazeEnv, MOVE_KEYS, observation_space
+from route_solver import solve_level
+
+
+def test_observation_views_are_read_only(game_file):
+    obs = MazeEnv(game_file).reset()
+    for name in ('tiles', 'items'):
+        with pytest.raises(ValueError):
+            obs[name][0, 0] = 0
+
+
+def test_observation_matches_space(game_file):
+    obs = MazeEnv(game_file).reset()
+    assert set(obs) == set(observation_space)
+    for name, space in observation_space.items():
+        assert obs[name].dtype == space.dtype
+        assert len(obs[name].shape) == len(space.shape)
+        for size, expected in zip(obs[name].shape, space.shape):
+            assert expected is None or size == expected
+
+
+def test_doors_unlock_with_last_coin(game_file):
+    env = MazeEnv(game_file)
+    obs = env.reset()
+    assert not obs['doors_unlocked'][0]
+    moves = solve_level(Model(game_file).get_level())
+    for key in moves[:-1]:
+        obs, _, _, _ = env.step(MOVE_KEYS.index(key))
+        maze = env.get_model().get_level().get_maze()
+        assert obs['doors_unlocked'][0] == maze.doors_unlocked()
+    # Only the move out through a door is left, so it must be unlocked
+    assert obs['doors_unlocked'][0]
+
+
+def test_vector_env_shares_rows(game_file):
+    envs = VectorMazeEnv(game_file, 3)
+    obs = envs.reset()
+    assert obs['doors_unlocked'].shape == (3, 1)
+    for index, env in enumerate(envs.envs):
+        single = env.get_observation()
+        assert np.shares_memory(single['doors_unlocked'],
+                                obs['doors_unlocked'][index])
+        assert single['tiles'] is obs['tiles'][index]
+        assert not obs['tiles'][index].flags.writeable
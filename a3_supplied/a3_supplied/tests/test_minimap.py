@@ -0,0 +1,33 @@
+""" Tests for the minimap's incremental redraws. """
+import pytest
+
+tk = pytest.importorskip('tkinter')
+
+from a2_solution import Model
+from constants import MINIMAP_SIZE
+
+
+@pytest.fixture
+def root():
+    """ A Tk root window, if there is a display to open it on. """
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip('no display')
+    yield root
+    root.destroy()
+
+
+def test_draw_repaints_collected_items(root, monkeypatch, game_file):
+    from a3 import MiniMapView
+    model = Model(game_file)
+    maze, items = model.get_current_maze(), model.get_current_items()
+    minimap = MiniMapView(root, MINIMAP_SIZE)
+    minimap.draw(maze, items, model.get_player().get_position())
+
+    drawn = []
+    monkeypatch.setattr(minimap, '_draw_block', drawn.append)
+    position = next(iter(items))
+    del items[position]
+    minimap.draw(maze, items, model.get_player().get_position())
+    assert minimap._block_of(position) in drawn
@@ -0,0 +1,61 @@
+""" Tests that moving through the move tables matches moving by tiles. """
+import random
+
+import pytest
+
+from a2_solution import Door, Model, load_game, MOVE_BITS, MOVE_OFF_GRID_SHIFT
+
+
+@pytest.mark.parametrize('unlocked', [False, True])
+def test_tables_match_tiles(game_file, unlocked):
+    for level in load_game(game_file):
+        maze = level.get_maze()
+        if unlocked:
+            maze.unlock_door()
+        num_rows, num_cols = maze.get_dimensions()
+        moves, damage, exits = maze.get_move_tables()
+        for row in range(num_rows):
+            for col in range(num_cols):
+                index = row * num_cols + col
+                tile = maze.get_tile((row, col))
+                assert damage[index] == tile.damage()
+                assert exits[index] == isinstance(tile, Door)
+                for (row_delta, col_delta), bit in MOVE_BITS.items():
+                    target = row + row_delta, col + col_delta
+                    off_grid = not (0 <= target[0] < num_rows
+                                    and 0 <= target[1] < num_cols)
+                    assert bool(moves[index] & bit << MOVE_OFF_GRID_SHIFT) \
+                        == off_grid
+                    assert bool(moves[index] & bit) == (
+                        not off_grid
+                        and not maze.get_tile(target).is_blocking())
+
+
+def _move_by_tiles(model: Model, delta: tuple[int, int]) -> None:
+    """ Moves the player as move_player did before the move tables. """
+    model._did_level_up = False
+    model._move_by_tiles(delta)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_move_player_matches_tiles(game_file, seed):
+    rng = random.Random(seed)
+    deltas = list(MOVE_BITS)
+    fast, slow = Model(game_file), Model(game_file)
+    for _ in range(400):
+        if fast.has_won() or fast.has_lost():
+            break
+        delta = rng.choice(deltas)
+        fast.move_player(delta)
+        _move_by_tiles(slow, delta)
+        for model in (fast, slow):
+            # Keep the player alive to explore further
+            model.get_player().change_health(1)
+        assert fast.get_level_num() == slow.get_level_num()
+        assert fast.did_level_up() == slow.did_level_up()
+        assert fast.get_player().get_position() == \
+            slow.get_player().get_position()
+        assert fast.get_player_stats() == slow.get_player_stats()
+        if not fast.has_won():
+            assert repr(fast.get_current_items()) == \
+                repr(slow.get_current_items())
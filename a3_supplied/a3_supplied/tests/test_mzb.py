@@ -0,0 +1,73 @@
+""" Tests for compiled .mzb game files. """
+import gc
+import weakref
+
+import pytest
+
+from a2_solution import Model, load_game
+from mzb import CompiledLevels, compile_game
+from route_solver import solve_game
+
+
+@pytest.fixture
+def compiled(game_file, tmp_path):
+    """ The game file compiled into a temporary directory. """
+    return compile_game(game_file, str(tmp_path / 'game.mzb'))
+
+
+def test_levels_match_text(game_file, compiled):
+    with CompiledLevels(compiled) as levels:
+        assert [str(level.get_maze()) for level in levels] == \
+            [str(level.get_maze()) for level in load_game(game_file)]
+
+
+def test_close_unmaps_file(compiled):
+    levels = CompiledLevels(compiled)
+    mapping = levels._mmap
+    levels[0]
+    levels.close()
+    assert mapping.closed
+    with pytest.raises(ValueError):
+        levels[0]
+
+
+def test_close_with_levels_in_use(compiled):
+    levels = CompiledLevels(compiled)
+    mapping = weakref.ref(levels._mmap)
+    level = levels[0]
+    levels.close()
+    # The level still views the mapping, which stays until it is gone
+    assert mapping() is not None and not mapping().closed
+    assert str(level.get_maze())
+    del level
+    gc.collect()
+    assert mapping() is None
+
+
+def test_recompile_while_open(game_file, compiled, tmp_path):
+    levels = CompiledLevels(compiled)
+    model = Model(compiled)
+    other = tmp_path / 'other.txt'
+    other.write_text('Maze 1 - 3 4\n####\n#P D\n####\n')
+    compile_game(str(other), compiled)
+    # What is open still reads the file as it was when it was mapped
+    assert [str(level.get_maze()) for level in levels] == \
+        [str(level.get_maze()) for level in load_game(game_file)]
+    while not model.has_won():
+        model.level_up()
+    with CompiledLevels(compiled) as recompiled:
+        assert len(recompiled) == 1
+        assert str(recompiled[0].get_maze()) == '####\n#  D\n####'
+    levels.close()
+
+
+def test_finished_game_closes_file(game_file, compiled):
+    model = Model(compiled, drop_finished=True)
+    mapping = weakref.ref(model._levels._mmap)
+    for move in solve_game(game_file):
+        model.get_player()._health = 100
+        model.get_player()._hunger = model.get_player()._thirst = 0
+        model.apply_moves(move)
+    assert model.has_won()
+    gc.collect()
+    assert mapping() is None or mapping().closed
@@ -0,0 +1,89 @@
+""" Tests for the move-phase profiler. """
+import pytest
+
+import a2_solution
+from a2_solution import MazeRunner, Model, TextInterface
+from profiling import (DEFAULT_PROFILE_FILE, Histogram, PROFILE_ENV,
+                       PROFILER, Profiler, requested_dump_path)
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = Histogram()
+    samples = [0.5e-6] + [3e-6] * 96 + [100e-6] * 2 + [200e-6]
+    for seconds in samples:
+        histogram.record(seconds)
+
+    buckets = histogram.to_dict()['buckets']
+    assert buckets[0] == 1      # under 1us
+    assert buckets[2] == 96     # [2, 4)us
+    assert buckets[7] == 2      # [64, 128)us
+    assert buckets[8] == 1      # [128, 256)us
+    assert sum(buckets) == histogram.get_count() == 100
+
+    assert histogram.get_percentile(50) == pytest.approx(0.004)
+    assert histogram.get_percentile(99) == pytest.approx(0.128)
+    # The top bucket's bound is capped at the longest duration seen
+    assert histogram.get_percentile(100) == pytest.approx(0.2)
+    assert histogram.get_max() == pytest.approx(0.2)
+    assert histogram.get_mean() == pytest.approx(sum(samples) / 100 * 1000)
+
+
+def test_histogram_clamps_long_durations():
+    histogram = Histogram()
+    histogram.record(10.0)
+    assert histogram.to_dict()['buckets'][-1] == 1
+    assert histogram.get_percentile(50) == pytest.approx(10000)
+    histogram.record(5.0)
+    assert histogram.get_percentile(50) == pytest.approx(10000)
+
+
+def test_empty_histogram():
+    histogram = Histogram()
+    assert histogram.get_count() == 0
+    assert histogram.get_mean() == histogram.get_percentile(99) == 0.0
+
+
+def test_requested_dump_path(monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    assert requested_dump_path([]) is None
+    assert requested_dump_path(['--profile']) == DEFAULT_PROFILE_FILE
+    assert requested_dump_path(['--profile=out.json']) == 'out.json'
+    monkeypatch.setenv(PROFILE_ENV, '0')
+    assert requested_dump_path([]) is None
+    monkeypatch.setenv(PROFILE_ENV, 'env.json')
+    assert requested_dump_path([]) == 'env.json'
+
+
+def test_instrument_records_calls():
+    class Phase:
+        def run(self, value):
+            return value * 2
+
+    profiler = Profiler()
+    profiler.instrument(Phase, 'run')
+    assert not hasattr(Phase.run, '_profiled')
+
+    profiler.enable()
+    profiler.instrument(Phase, 'run')
+    profiler.instrument(Phase, 'run')
+    assert Phase().run(3) == 6
+    assert profiler.get_histograms()['Phase.run'].get_count() == 1
+
+
+def test_main_does_not_profile_by_default(monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    monkeypatch.setattr('sys.argv', ['a2_solution.py'])
+    originals = {(cls, name): getattr(cls, name) for cls, name in
+                 [(MazeRunner, '_apply_move'), (Model, 'move_player'),
+                  (Model, 'attempt_collect_item'), (TextInterface, 'draw')]}
+
+    def stop(prompt):
+        raise EOFError
+    monkeypatch.setattr('builtins.input', stop)
+    with pytest.raises(EOFError):
+        a2_solution.main()
+
+    assert not PROFILER.enabled
+    assert PROFILER.get_histograms() == {}
+    for (cls, name), method in originals.items():
+        assert getattr(cls, name) is method
@@ -0,0 +1,22 @@
+""" Tests for the coin route solver. """
+from a2_solution import Model, MoveSummary
+from route_solver import solve_game, solve_level
+
+
+def test_routes_finish_levels(game_file):
+    model = Model(game_file)
+    for move in solve_game(game_file):
+        # Routes ignore HP, hunger and thirst, so keep the player alive
+        model.get_player()._health = 100
+        model.get_player()._hunger = model.get_player()._thirst = 0
+        model.apply_moves(move)
+    assert model.has_won()
+
+
+def test_route_without_coins(tmp_path):
+    # The door next to the start only unlocks after the first step
+    level_file = tmp_path / 'level.txt'
+    level_file.write_text('Maze 1 - 3 5\n#####\n#  PD\n#####\n')
+    model = Model(str(level_file))
+    summary = model.apply_moves(solve_level(model.get_level()))
+    assert summary.outcome == MoveSummary.WON
@@ -0,0 +1,62 @@
+""" Tests that the incremental state hash matches one computed afresh. """
+import random
+
+from a2_solution import Model, Potion, Water, _zobrist_key, MOVE_DELTAS, \
+    DOOR_UNLOCKED, ITEM_REMOVED, LEVEL_CHANGED
+from route_solver import solve_game
+
+
+def _assert_rehash_matches(model: Model) -> None:
+    """ Checks the model's hash is unchanged by recomputing it. """
+    expected = model.state_hash()
+    model.rehash()
+    assert model.state_hash() == expected
+
+
+def test_hash_follows_play(game_file):
+    rng = random.Random(0)
+    model = Model(game_file)
+    events = []
+    model.subscribe(events.extend)
+    for move in solve_game(game_file):
+        player = model.get_player()
+        # Routes ignore HP, hunger and thirst, so keep the player alive
+        player._health, player._hunger, player._thirst = 100, 0, 0
+        model.move_player(MOVE_DELTAS[move])
+        _assert_rehash_matches(model)
+        if model.has_won():
+            break
+
+        names = list(model.get_player_inventory().get_items())
+        if names and rng.random() < 0.2:
+            model.use_item(rng.choice(names))
+            _assert_rehash_matches(model)
+        if rng.random() < 0.1:
+            model.add_inventory_item(rng.choice((Potion, Water))((0, 0)))
+            _assert_rehash_matches(model)
+        if names and rng.random() < 0.1:
+            model.remove_inventory_item(rng.choice(names))
+            _assert_rehash_matches(model)
+    assert model.has_won()
+    assert {ITEM_REMOVED, DOOR_UNLOCKED, LEVEL_CHANGED} <= \
+        {kind for kind, _ in events}
+
+
+def test_apply_moves_hash(game_file):
+    rng = random.Random(1)
+    model = Model(game_file)
+    for _ in range(20):
+        model.apply_moves(''.join(rng.choice('wasd') for _ in range(20)))
+        _assert_rehash_matches(model)
+        if model.has_lost():
+            break
+
+
+def test_key_cache_is_bounded(game_file):
+    model = Model(game_file)
+    for _ in range(_zobrist_key.cache_info().maxsize + 10):
+        model._num_moves += 1
+        model.get_player().set_position((model._num_moves, 0))
+        model.state_hash()
+    info = _zobrist_key.cache_info()
+    assert info.currsize <= info.maxsize
@@ -0,0 +1,96 @@
+""" Tests for the survival-aware planner. """
+import copy
+import os
+
+import pytest
+
+from a2_solution import Model, load_game, MOVE_DELTAS
+from survival_planner import plan_game, plan_level
+
+GAMES = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'games')
+
+# A level whose shortest route crosses lava, with a longer one around it
+TOY_LEVEL = """Maze 1 - 5 7
+#######
+#P L CD
+# ### #
+#     #
+#######
+"""
+
+
+def _replay(model: Model, commands: list[str]) -> None:
+    """ Gives a plan's commands to a model, moves in runs through
+        apply_moves and item uses through use_item.
+    """
+    moves = ''
+    for command in commands + ['']:
+        if command in MOVE_DELTAS:
+            moves += command
+            continue
+        while moves and not (model.has_won() or model.has_lost()):
+            made = model.apply_moves(moves).get_num_moves()
+            moves = moves[made:]
+        if command:
+            assert model.use_item(command.partition(' ')[2])
+
+
+@pytest.mark.parametrize('name', ['game1.txt', 'game2.txt', 'game3.txt'])
+def test_plans_win(name):
+    game_file = os.path.join(GAMES, name)
+    commands = plan_game(game_file)
+    assert commands is not None
+    model = Model(game_file)
+    _replay(model, commands)
+    assert model.has_won() and not model.has_lost()
+
+
+def test_unsurvivable_level():
+    # The second level of masters1 needs more moves than thirst allows, and
+    # has no water
+    level = load_game(os.path.join(GAMES, 'masters1.txt'))[1]
+    assert plan_level(level) is None
+    assert plan_game(os.path.join(GAMES, 'masters1.txt')) is None
+
+
+def _fewest_moves(model: Model) -> int:
+    """ Returns the fewest moves which finish the model's level, found by an
+        exhaustive breadth-first search over copies of the model, or None.
+    """
+    def key(state: Model) -> tuple:
+        return (state.get_player().get_position(), state.get_player_stats(),
+                state.get_num_moves() % 5,
+                tuple(sorted(state.get_current_items())))
+
+    frontier, seen, depth = [model], {key(model)}, 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            for delta in MOVE_DELTAS.values():
+                child = copy.deepcopy(state)
+                child.move_player(delta)
+                if child.did_level_up() or child.has_won():
+                    return depth
+                if not child.has_lost() and key(child) not in seen:
+                    seen.add(key(child))
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return None
+
+
+@pytest.mark.parametrize('health', [100, 12, 11, 10, 9])
+def test_plan_is_fastest(tmp_path, health):
+    level_file = tmp_path / 'toy.txt'
+    level_file.write_text(TOY_LEVEL)
+    model = Model(str(level_file))
+    model.get_player()._health = health
+    fewest = _fewest_moves(model)
+
+    plan = plan_level(load_game(str(level_file))[0], stats=(health, 0, 0))
+    if fewest is None:
+        assert plan is None
+    else:
+        assert plan is not None and len(plan) == fewest
+        _replay(model, plan)
+        assert model.has_won()